@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import FrozenSet
 import os
 
 class Settings(BaseSettings):
@@ -30,12 +31,12 @@ class Settings(BaseSettings):
     max_file_size: int = 100 * 1024 * 1024  # 100MB
     upload_directory: str = "/tmp/documents"
     export_directory: str = "/tmp/exports"
-    allowed_mime_types: list = [
+    allowed_mime_types: FrozenSet[str] = frozenset({
         "application/pdf",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "text/plain",
         "text/markdown"
-    ]
+    })
     
     # Processing settings
     # Chunked ontology generation is now enabled by default for large documents (>8K chars)
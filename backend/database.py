@@ -4,6 +4,7 @@ from sqlalchemy.orm import sessionmaker, Session, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 import uuid
+import orjson
 
 from config import get_settings
 
@@ -14,10 +15,16 @@ connect_args = {}
 if "sqlite" in settings.database_url:
     connect_args = {"check_same_thread": False}
 
+def _json_serializer(value) -> str:
+    """Serialize JSON columns (nodes, relationships, triples, metadata) with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 engine = create_engine(
     settings.database_url,
     echo=settings.database_echo,
-    connect_args=connect_args
+    connect_args=connect_args,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
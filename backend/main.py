@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
 import uvicorn
@@ -41,7 +42,9 @@ app = FastAPI(
     title="DeepInsight API",
     description="MVP API for document ontology extraction and graph database export",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson serializes the large ontology/extraction payloads much faster than json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
+import time
 
-from database import get_db, User, Document, Ontology, UserSettings
+from database import get_db, SessionLocal, User, Document, Ontology, UserSettings
 from models.ontologies import (
     OntologyCreateRequest, OntologyUpdateRequest, OntologyResponse, 
     OntologyDetailResponse, OntologyTriple
@@ -13,6 +18,11 @@ from utils.ai_agents import create_ontology_from_document
 
 router = APIRouter()
 
+# How often the progress event stream re-reads the ontology row
+PROGRESS_EVENT_INTERVAL_SECONDS = 1.0
+# Longest a progress event stream stays open; clients fall back to polling after it ends
+PROGRESS_EVENT_MAX_SECONDS = 30 * 60
+
 @router.post("/", response_model=OntologyResponse)
 async def create_ontology(
     ontology_data: OntologyCreateRequest,
@@ -340,10 +350,11 @@ async def reprocess_ontology(
 @router.get("/{ontology_id}/progress")
 async def get_ontology_progress(
     ontology_id: str,
+    include_triples: bool = Query(False, description="Include triples once generation is complete"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get the progress of ontology generation"""
+    """Get the progress of ontology generation, optionally with the finished triples"""
     ontology = db.query(Ontology).filter(
         Ontology.id == ontology_id,
         Ontology.user_id == current_user.id
@@ -355,6 +366,66 @@ async def get_ontology_progress(
             detail="Ontology not found"
         )
     
+    return _progress_data(ontology, include_triples)
+
+@router.get("/{ontology_id}/events")
+async def stream_ontology_progress(
+    ontology_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream ontology generation progress as Server-Sent Events until processing ends"""
+    ontology = db.query(Ontology).filter(
+        Ontology.id == ontology_id,
+        Ontology.user_id == current_user.id
+    ).first()
+    
+    if not ontology:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ontology not found"
+        )
+    
+    user_id = current_user.id
+    # Release the request's pooled connection; each poll uses its own short-lived session
+    db.close()
+    
+    async def events():
+        last_event = None
+        deadline = time.monotonic() + PROGRESS_EVENT_MAX_SECONDS
+        while True:
+            progress = await run_in_threadpool(_load_progress_data, ontology_id, user_id)
+            if progress is None:
+                break
+            event = json.dumps(progress)
+            # Only push when something changed
+            if event != last_event:
+                yield f"data: {event}\n\n"
+                last_event = event
+            if progress["status"] != "processing" or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(PROGRESS_EVENT_INTERVAL_SECONDS)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+def _load_progress_data(ontology_id: str, user_id: str) -> Optional[dict]:
+    """Read an ontology's progress payload in its own session (runs in the threadpool)"""
+    db = SessionLocal()
+    try:
+        ontology = db.query(Ontology).filter(
+            Ontology.id == ontology_id,
+            Ontology.user_id == user_id
+        ).first()
+        return _progress_data(ontology) if ontology else None
+    finally:
+        db.close()
+
+def _progress_data(ontology: Ontology, include_triples: bool = False) -> dict:
+    """Build the progress payload shared by the progress endpoint and event stream"""
     # Prepare progress response
     progress_data = {
         "id": ontology.id,
@@ -373,6 +444,13 @@ async def get_ontology_progress(
     else:
         progress_data["progress_percentage"] = 0 if ontology.status == "processing" else 100
     
+    # Report the finished triples from the same row so pollers skip a second request;
+    # the count alone lets callers avoid downloading the full list
+    if ontology.status == "active":
+        progress_data["triples_count"] = len(ontology.triples or [])
+        if include_triples:
+            progress_data["triples"] = ontology.triples or []
+    
     return progress_data
 
 @router.delete("/{ontology_id}")
@@ -6,6 +6,8 @@ from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
 class GraphNode:
+    __slots__ = ('id', 'type', 'properties', 'source_location')
+    
     def __init__(self, id: str, type: str, properties: Dict[str, Any], source_location: str = None):
         self.id = id
         self.type = type
@@ -13,6 +15,8 @@ class GraphNode:
         self.source_location = source_location
 
 class GraphRelationship:
+    __slots__ = ('id', 'type', 'source_id', 'target_id', 'properties', 'source_location')
+    
     def __init__(self, id: str, type: str, source_id: str, target_id: str, 
                  properties: Dict[str, Any] = None, source_location: str = None):
         self.id = id
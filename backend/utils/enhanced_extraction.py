@@ -4,12 +4,13 @@ for GUID-based node IDs and mandatory name properties.
 """
 import uuid
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractedEntity:
     """Represents an extracted entity with its properties"""
     temp_id: str  # AI-generated temporary ID
@@ -19,7 +20,7 @@ class ExtractedEntity:
     source_location: Optional[str] = None
     chunk_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractedRelationship:
     """Represents an extracted relationship"""
     temp_id: str
@@ -30,6 +31,28 @@ class ExtractedRelationship:
     source_location: Optional[str] = None
     chunk_id: Optional[int] = None
 
+@lru_cache(maxsize=16384)
+def _normalize_entity_name(name: str) -> str:
+    """Normalize an entity name; memoized because the same names recur across chunks"""
+    if not name:
+        return name
+    
+    # Basic normalization: strip and collapse whitespace runs (e.g. names wrapped
+    # across lines), then convert to title case
+    normalized = " ".join(name.split())
+    
+    # For entities that are likely proper nouns, use title case
+    # This converts "TURKISH AIRLINES" -> "Turkish Airlines"
+    # and keeps "Turkish Airlines" as "Turkish Airlines"
+    normalized = normalized.title()
+    
+    # Handle common abbreviations and codes that should remain uppercase
+    # Airport codes, airline codes, etc.
+    if len(normalized) <= 4 and normalized.isalpha():
+        normalized = normalized.upper()
+    
+    return normalized
+
 class EntityRegistry:
     """
     Registry for managing unique entities across document chunks.
@@ -46,23 +69,7 @@ class EntityRegistry:
         Normalize entity name to consistent format for deduplication.
         Converts to title case for proper nouns (organizations, people, places).
         """
-        if not name:
-            return name
-        
-        # Basic normalization: strip whitespace and convert to title case
-        normalized = name.strip()
-        
-        # For entities that are likely proper nouns, use title case
-        # This converts "TURKISH AIRLINES" -> "Turkish Airlines"
-        # and keeps "Turkish Airlines" as "Turkish Airlines"
-        normalized = normalized.title()
-        
-        # Handle common abbreviations and codes that should remain uppercase
-        # Airport codes, airline codes, etc.
-        if len(normalized) <= 4 and normalized.isalpha():
-            normalized = normalized.upper()
-        
-        return normalized
+        return _normalize_entity_name(name)
         
     def register_entity(self, entity: ExtractedEntity) -> str:
         """
@@ -77,22 +84,20 @@ class EntityRegistry:
         
         # Create unique key using type and normalized name
         entity_key = (entity.entity_type, normalized_name)
+        temp_key = f"chunk_{entity.chunk_id}_{entity.temp_id}"
         
-        # Check if entity already exists
-        if entity_key in self.entities:
-            existing_guid = self.entities[entity_key]
+        # Check if entity already exists with a single hash probe
+        existing_guid = self.entities.get(entity_key)
+        if existing_guid is not None:
             # Update mapping for this temp_id
-            temp_key = f"chunk_{entity.chunk_id}_{entity.temp_id}"
             self.ai_id_mapping[temp_key] = existing_guid
             
             # Merge properties if needed (keep most complete version)
             existing_entity = self.entity_details[existing_guid]
             if len(entity.properties) > len(existing_entity.properties):
-                # Update entity with normalized name
-                entity.name = normalized_name
+                # Update entity with normalized name, using GUID as final ID
                 entity.properties['name'] = normalized_name
-                self.entity_details[existing_guid] = entity
-                self.entity_details[existing_guid].temp_id = existing_guid  # Use GUID as final ID
+                self.entity_details[existing_guid] = replace(entity, name=normalized_name, temp_id=existing_guid)
             
             logger.info(f"Reused existing entity {existing_guid} for {entity_key}")
             return existing_guid
@@ -102,34 +107,42 @@ class EntityRegistry:
             self.entities[entity_key] = new_guid
             
             # Update mapping
-            temp_key = f"chunk_{entity.chunk_id}_{entity.temp_id}"
             self.ai_id_mapping[temp_key] = new_guid
             
             # Store entity details with GUID as final ID and normalized name
-            entity.name = normalized_name
             entity.properties['name'] = normalized_name
-            entity.temp_id = new_guid
-            self.entity_details[new_guid] = entity
+            self.entity_details[new_guid] = replace(entity, name=normalized_name, temp_id=new_guid)
             
             logger.info(f"Created new entity {new_guid} for {entity_key}")
             return new_guid
     
+    def register_entities(self, entities: List[ExtractedEntity]) -> List[str]:
+        """
+        Register a batch of entities in order and return their GUIDs.
+        Equivalent to calling register_entity on each, so the keep-most-complete
+        merge and temp ID mappings behave exactly as for single registrations.
+        """
+        register = self.register_entity
+        return [register(entity) for entity in entities]
+    
     def resolve_temp_id(self, chunk_id: int, temp_id: str) -> Optional[str]:
         """Resolve a temporary AI-generated ID to its final GUID"""
         temp_key = f"chunk_{chunk_id}_{temp_id}"
         return self.ai_id_mapping.get(temp_key)
     
+    @staticmethod
+    def _entity_node(guid: str, entity: ExtractedEntity) -> Dict[str, Any]:
+        """Shape a registered entity as a JSON-serializable node dict"""
+        return {
+            "id": guid,
+            "type": entity.entity_type,
+            "properties": entity.properties,
+            "source_location": entity.source_location
+        }
+    
     def get_all_entities(self) -> List[Dict[str, Any]]:
         """Get all unique entities as JSON-serializable dicts"""
-        entities = []
-        for guid, entity in self.entity_details.items():
-            entities.append({
-                "id": guid,
-                "type": entity.entity_type,
-                "properties": entity.properties,
-                "source_location": entity.source_location
-            })
-        return entities
+        return [self._entity_node(guid, entity) for guid, entity in self.entity_details.items()]
     
     def get_entity_count(self) -> int:
         """Get total number of unique entities"""
@@ -229,23 +242,24 @@ class EnhancedExtractionProcessor:
         """
         # Process entities
         nodes = chunk_result.get("nodes", [])
+        entities = []
         for node_data in nodes:
             # Validate name property
             if "name" not in node_data.get("properties", {}):
                 logger.error(f"Node {node_data.get('id')} missing mandatory 'name' property")
                 continue
             
-            entity = ExtractedEntity(
+            entities.append(ExtractedEntity(
                 temp_id=node_data["id"],
                 entity_type=node_data["type"],
                 name=node_data["properties"]["name"],
                 properties=node_data["properties"],
                 source_location=node_data.get("source_location"),
                 chunk_id=chunk_id
-            )
-            
-            # Register entity and get GUID
-            self.entity_registry.register_entity(entity)
+            ))
+        
+        # Register the chunk's entities as one batch
+        self.entity_registry.register_entities(entities)
         
         # Process relationships (store for later resolution)
         relationships = chunk_result.get("relationships", [])
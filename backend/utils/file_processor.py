@@ -140,19 +140,18 @@ class DocumentProcessorFactory:
         
         return processor
 
+# Allowed (extension, MIME type) pairs for uploads
+_ALLOWED_FILE_TYPES = frozenset({
+    (".pdf", "application/pdf"),
+    (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (".txt", "text/plain"),
+    (".md", "text/markdown")
+})
+
 def validate_file_type(filename: str, mime_type: str) -> bool:
     """Validate file type based on filename and MIME type"""
-    allowed_extensions = {
-        ".pdf": "application/pdf",
-        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ".txt": "text/plain",
-        ".md": "text/markdown"
-    }
-    
-    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    file_ext = f'.{file_ext}'
-    
-    return file_ext in allowed_extensions and allowed_extensions[file_ext] == mime_type
+    _, dot, file_ext = filename.rpartition('.')
+    return bool(dot) and (f'.{file_ext.lower()}', mime_type) in _ALLOWED_FILE_TYPES
 
 def validate_file_size(file_size: int, max_size: int = 100 * 1024 * 1024) -> bool:
     """Validate file size (default max: 100MB)"""
@@ -54,7 +54,7 @@ def find_text_at_location(document_path: str, source_location: str, context_char
         context_text = content[context_start:context_end]
         
         # Calculate line numbers
-        lines_before = content[:start_pos].count('\n')
+        lines_before = content.count('\n', 0, start_pos)
         start_line = lines_before + 1
         
         lines_in_text = exact_text.count('\n')
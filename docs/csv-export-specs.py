@@ -2,21 +2,55 @@
 # Complete Neo4j and Neptune CSV export implementations
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Sequence
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import io
 from datetime import datetime
 import re
 import json
+from operator import itemgetter
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; exports fall back to the csv module
+    pa = None
+    pa_csv = None
+
+# Below this many rows Arrow's setup cost outweighs its faster CSV encoder
+ARROW_MIN_ROWS = 1000
+
+# Exports up to this many rows are rendered in memory and written with one call
+SINGLE_WRITE_MAX_ROWS = 10000
+
+# Buffer size for streamed CSV writes (default io buffer is 8KB)
+WRITE_BUFFER_SIZE = 1024 * 1024  # 1MB
 
 # ============================================================================
 # Data Classes for Export
 # ============================================================================
 
+_UNSAFE_ID_CHARS = re.compile(r'[^\w\-]')
+
+@lru_cache(maxsize=65536)
+def _sanitize_graph_id(raw_id: str, prefix: str) -> str:
+    """Sanitize an ID for database compatibility, memoized per (ID, prefix)"""
+    # Remove special characters and spaces, replace with underscores
+    sanitized = _UNSAFE_ID_CHARS.sub('_', raw_id)
+    # Ensure ID starts with letter or underscore
+    if sanitized and sanitized[0].isdigit():
+        sanitized = f"{prefix}_{sanitized}"
+    return sanitized or f"unknown_{prefix}"
+
 class GraphNode:
     """Represents a graph node for export"""
     
+    __slots__ = ('id', 'type', 'properties', 'source_location')
+    
     def __init__(self, id: str, type: str, properties: Dict[str, Any], source_location: Optional[str] = None):
         self.id = self._sanitize_id(id)
         self.type = type
@@ -26,16 +60,13 @@ class GraphNode:
     @staticmethod
     def _sanitize_id(node_id: str) -> str:
         """Sanitize node ID for database compatibility"""
-        # Remove special characters and spaces, replace with underscores
-        sanitized = re.sub(r'[^\w\-]', '_', str(node_id))
-        # Ensure ID starts with letter or underscore
-        if sanitized and sanitized[0].isdigit():
-            sanitized = f"node_{sanitized}"
-        return sanitized or "unknown_node"
+        return _sanitize_graph_id(str(node_id), "node")
 
 class GraphEdge:
     """Represents a graph edge for export"""
     
+    __slots__ = ('id', 'type', 'source_id', 'target_id', 'properties', 'source_location')
+    
     def __init__(self, id: str, type: str, source_id: str, target_id: str, 
                  properties: Dict[str, Any] = None, source_location: Optional[str] = None):
         self.id = self._sanitize_id(id)
@@ -48,10 +79,45 @@ class GraphEdge:
     @staticmethod
     def _sanitize_id(edge_id: str) -> str:
         """Sanitize edge ID for database compatibility"""
-        sanitized = re.sub(r'[^\w\-]', '_', str(edge_id))
-        if sanitized and sanitized[0].isdigit():
-            sanitized = f"edge_{sanitized}"
-        return sanitized or "unknown_edge"
+        return _sanitize_graph_id(str(edge_id), "edge")
+
+# ============================================================================
+# Property Serialization
+# ============================================================================
+
+def _serialize_fallback(value: Any) -> str:
+    """Serialize values whose exact type is not in the dispatch table"""
+    # Subclasses of dict/list (e.g. OrderedDict) still serialize as JSON
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+# Dispatch on exact type: one dict lookup per value instead of a chain of
+# isinstance checks. Strings, the common case, pass through unchanged.
+_SERIALIZERS = {
+    str: lambda value: value,
+    int: str,
+    float: str,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "",
+    dict: json.dumps,
+    list: json.dumps,
+}
+
+def _serialize_value(value: Any) -> str:
+    """Serialize a single property value to its CSV string form"""
+    return _SERIALIZERS.get(type(value), _serialize_fallback)(value)
+
+def _serialize_properties(properties: Dict[str, Any]) -> Dict[str, str]:
+    """Serialize properties to string values for CSV"""
+    return {key: _serialize_value(value) for key, value in properties.items()}
+
+# Relationship types have low cardinality, so cache their label forms
+# instead of allocating a new string per edge row
+_upper_label = lru_cache(maxsize=256)(str.upper)
+_lower_label = lru_cache(maxsize=256)(str.lower)
 
 # ============================================================================
 # Base Export Class
@@ -75,18 +141,55 @@ class BaseGraphExporter(ABC):
         """Export complete graph to CSV files"""
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Export nodes
         nodes_file = output_dir / f"{filename_prefix}_nodes.csv"
-        nodes_path = self.export_nodes(nodes, nodes_file)
-        
-        # Export edges  
         edges_file = output_dir / f"{filename_prefix}_edges.csv"
-        edges_path = self.export_edges(edges, edges_file)
         
-        return {
-            "nodes_csv": nodes_path,
-            "edges_csv": edges_path
-        }
+        # Nodes and edges go to independent files, so write them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            nodes_future = executor.submit(self.export_nodes, nodes, nodes_file)
+            edges_future = executor.submit(self.export_edges, edges, edges_file)
+            
+            return {
+                "nodes_csv": nodes_future.result(),
+                "edges_csv": edges_future.result()
+            }
+    
+    @staticmethod
+    def _write_csv(output_path: Path, headers: List[str],
+                   rows: Iterable[Sequence[str]], row_count: int) -> None:
+        """
+        Write header and rows to a CSV file
+        
+        Large exports are encoded by pyarrow when it is installed. Arrow writes
+        LF line endings where the csv module writes CRLF; both Neo4j and
+        Neptune loaders accept either. Other exports up to SINGLE_WRITE_MAX_ROWS
+        rows are rendered in memory and handed to the OS in a single write.
+        """
+        if pa_csv is not None and row_count >= ARROW_MIN_ROWS:
+            columns = list(zip(*rows))
+            table = pa.Table.from_arrays(
+                [pa.array(column, type=pa.string()) for column in columns],
+                names=headers
+            )
+            pa_csv.write_csv(
+                table,
+                str(output_path),
+                write_options=pa_csv.WriteOptions(include_header=True, quoting_style="needed")
+            )
+            return
+        
+        if row_count <= SINGLE_WRITE_MAX_ROWS:
+            buffer = io.StringIO(newline='')
+            writer = csv.writer(buffer)
+            writer.writerow(headers)
+            writer.writerows(rows)
+            output_path.write_bytes(buffer.getvalue().encode('utf-8'))
+            return
+        
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(rows)
     
     @staticmethod
     def _escape_csv_value(value: Any) -> str:
@@ -109,21 +212,20 @@ class BaseGraphExporter(ABC):
     @staticmethod
     def _serialize_properties(properties: Dict[str, Any]) -> Dict[str, str]:
         """Serialize properties to string values for CSV"""
-        serialized = {}
-        
-        for key, value in properties.items():
-            if isinstance(value, (dict, list)):
-                # Serialize complex objects as JSON
-                serialized[key] = json.dumps(value)
-            elif isinstance(value, bool):
-                # Convert boolean to string
-                serialized[key] = "true" if value else "false"
-            elif value is None:
-                serialized[key] = ""
-            else:
-                serialized[key] = str(value)
-        
-        return serialized
+        return _serialize_properties(properties)
+    
+    @staticmethod
+    def _property_getter(property_keys: List[str]) -> Callable[[Dict[str, str]], Tuple[str, ...]]:
+        """Build a callable returning serialized property values in header order"""
+        if not property_keys:
+            return lambda serialized_props: ()
+        
+        # Missing keys fall back to '' and itemgetter pulls every column in one call
+        defaults = dict.fromkeys(property_keys, '')
+        getter = itemgetter(*property_keys)
+        if len(property_keys) == 1:
+            return lambda serialized_props: (getter({**defaults, **serialized_props}),)
+        return lambda serialized_props: getter({**defaults, **serialized_props})
 
 # ============================================================================
 # Neo4j CSV Exporter
@@ -139,43 +241,30 @@ class Neo4jExporter(BaseGraphExporter):
         Format: nodeId:ID,name,type,:LABEL
         Example: person1,John Doe,string,Person
         """
-        if not nodes:
-            # Create empty file with headers
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['nodeId:ID', ':LABEL'])
-            return str(output_path)
-        
-        # Collect all unique property keys
+        # Serialize properties once and collect all unique property keys
+        serialized = [self._serialize_properties(node.properties) for node in nodes]
         all_property_keys = set()
-        for node in nodes:
-            serialized_props = self._serialize_properties(node.properties)
+        for serialized_props in serialized:
             all_property_keys.update(serialized_props.keys())
         
         # Sort property keys for consistent output
         property_keys = sorted(all_property_keys)
+        property_values = self._property_getter(property_keys)
         
         # Create header row
         headers = ['nodeId:ID'] + property_keys + ['source_location', ':LABEL']
         
-        # Write CSV file
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            for node in nodes:
-                serialized_props = self._serialize_properties(node.properties)
-                row = [node.id]
-                
-                # Add property values in same order as headers
-                for prop_key in property_keys:
-                    row.append(serialized_props.get(prop_key, ''))
-                
-                # Add source location and label
-                row.append(node.source_location or '')
-                row.append(node.type)
-                
-                writer.writerow(row)
+        # Property values in same order as headers, then source location and label
+        rows = (
+            (
+                node.id,
+                *property_values(serialized_props),
+                node.source_location or '',
+                node.type
+            )
+            for node, serialized_props in zip(nodes, serialized)
+        )
+        self._write_csv(output_path, headers, rows, len(nodes))
         
         return str(output_path)
     
@@ -186,42 +275,31 @@ class Neo4jExporter(BaseGraphExporter):
         Format: :START_ID,:END_ID,:TYPE,properties...,source_location
         Example: person1,org1,WORKS_FOR,"page 1, line 15"
         """
-        if not edges:
-            # Create empty file with headers
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([':START_ID', ':END_ID', ':TYPE'])
-            return str(output_path)
-        
-        # Collect all unique property keys
+        # Serialize properties once and collect all unique property keys
+        serialized = [self._serialize_properties(edge.properties) for edge in edges]
         all_property_keys = set()
-        for edge in edges:
-            serialized_props = self._serialize_properties(edge.properties)
+        for serialized_props in serialized:
             all_property_keys.update(serialized_props.keys())
         
         # Sort property keys for consistent output
         property_keys = sorted(all_property_keys)
+        property_values = self._property_getter(property_keys)
         
         # Create header row
         headers = [':START_ID', ':END_ID', ':TYPE'] + property_keys + ['source_location']
         
-        # Write CSV file
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            for edge in edges:
-                serialized_props = self._serialize_properties(edge.properties)
-                row = [edge.source_id, edge.target_id, edge.type.upper()]
-                
-                # Add property values in same order as headers
-                for prop_key in property_keys:
-                    row.append(serialized_props.get(prop_key, ''))
-                
-                # Add source location
-                row.append(edge.source_location or '')
-                
-                writer.writerow(row)
+        # Property values in same order as headers, then source location
+        rows = (
+            (
+                edge.source_id,
+                edge.target_id,
+                _upper_label(edge.type),
+                *property_values(serialized_props),
+                edge.source_location or ''
+            )
+            for edge, serialized_props in zip(edges, serialized)
+        )
+        self._write_csv(output_path, headers, rows, len(edges))
         
         return str(output_path)
     
@@ -267,42 +345,30 @@ class NeptuneExporter(BaseGraphExporter):
         Format: ~id,~label,property1,property2,...
         Example: person1,Person,John Doe,string
         """
-        if not nodes:
-            # Create empty file with headers
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['~id', '~label'])
-            return str(output_path)
-        
-        # Collect all unique property keys
+        # Serialize properties once and collect all unique property keys
+        serialized = [self._serialize_properties(node.properties) for node in nodes]
         all_property_keys = set()
-        for node in nodes:
-            serialized_props = self._serialize_properties(node.properties)
+        for serialized_props in serialized:
             all_property_keys.update(serialized_props.keys())
         
         # Sort property keys for consistent output
         property_keys = sorted(all_property_keys)
+        property_values = self._property_getter(property_keys)
         
         # Create header row
         headers = ['~id', '~label'] + property_keys + ['source_location']
         
-        # Write CSV file
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            for node in nodes:
-                serialized_props = self._serialize_properties(node.properties)
-                row = [node.id, node.type]
-                
-                # Add property values in same order as headers
-                for prop_key in property_keys:
-                    row.append(serialized_props.get(prop_key, ''))
-                
-                # Add source location
-                row.append(node.source_location or '')
-                
-                writer.writerow(row)
+        # Property values in same order as headers, then source location
+        rows = (
+            (
+                node.id,
+                node.type,
+                *property_values(serialized_props),
+                node.source_location or ''
+            )
+            for node, serialized_props in zip(nodes, serialized)
+        )
+        self._write_csv(output_path, headers, rows, len(nodes))
         
         return str(output_path)
     
@@ -313,42 +379,32 @@ class NeptuneExporter(BaseGraphExporter):
         Format: ~id,~from,~to,~label,property1,property2,...
         Example: rel1,person1,org1,works_for,"page 1, line 15"
         """
-        if not edges:
-            # Create empty file with headers
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['~id', '~from', '~to', '~label'])
-            return str(output_path)
-        
-        # Collect all unique property keys
+        # Serialize properties once and collect all unique property keys
+        serialized = [self._serialize_properties(edge.properties) for edge in edges]
         all_property_keys = set()
-        for edge in edges:
-            serialized_props = self._serialize_properties(edge.properties)
+        for serialized_props in serialized:
             all_property_keys.update(serialized_props.keys())
         
         # Sort property keys for consistent output
         property_keys = sorted(all_property_keys)
+        property_values = self._property_getter(property_keys)
         
         # Create header row
         headers = ['~id', '~from', '~to', '~label'] + property_keys + ['source_location']
         
-        # Write CSV file
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            for edge in edges:
-                serialized_props = self._serialize_properties(edge.properties)
-                row = [edge.id, edge.source_id, edge.target_id, edge.type.lower()]
-                
-                # Add property values in same order as headers
-                for prop_key in property_keys:
-                    row.append(serialized_props.get(prop_key, ''))
-                
-                # Add source location
-                row.append(edge.source_location or '')
-                
-                writer.writerow(row)
+        # Property values in same order as headers, then source location
+        rows = (
+            (
+                edge.id,
+                edge.source_id,
+                edge.target_id,
+                _lower_label(edge.type),
+                *property_values(serialized_props),
+                edge.source_location or ''
+            )
+            for edge, serialized_props in zip(edges, serialized)
+        )
+        self._write_csv(output_path, headers, rows, len(edges))
         
         return str(output_path)
     
@@ -398,22 +454,20 @@ def transform_extraction_results_to_graph_data(
     Returns:
         Tuple of (nodes, edges) ready for export
     """
-    nodes = []
-    edges = []
-    
-    # Process nodes
-    for node_data in extraction_results.get('nodes', []):
-        node = GraphNode(
+    # Edge endpoints repeat node IDs, so most sanitization calls hit the
+    # _sanitize_graph_id cache; list comprehensions avoid per-item append calls
+    nodes = [
+        GraphNode(
             id=node_data.get('id', ''),
             type=node_data.get('type', 'Unknown'),
             properties=node_data.get('properties', {}),
             source_location=node_data.get('source_location')
         )
-        nodes.append(node)
+        for node_data in extraction_results.get('nodes', [])
+    ]
     
-    # Process relationships/edges
-    for edge_data in extraction_results.get('relationships', []):
-        edge = GraphEdge(
+    edges = [
+        GraphEdge(
             id=edge_data.get('id', ''),
             type=edge_data.get('type', 'RELATED'),
             source_id=edge_data.get('source_id', ''),
@@ -421,7 +475,8 @@ def transform_extraction_results_to_graph_data(
             properties=edge_data.get('properties', {}),
             source_location=edge_data.get('source_location')
         )
-        edges.append(edge)
+        for edge_data in extraction_results.get('relationships', [])
+    ]
     
     return nodes, edges
 
@@ -442,15 +497,29 @@ def validate_graph_data(nodes: List[GraphNode], edges: List[GraphEdge]) -> List[
     # Collect node IDs
     node_ids = {node.id for node in nodes}
     
+    # Dangling references are found with set differences; per-edge messages
+    # are only built for the edges that actually reference a missing node
+    missing_sources = {edge.source_id for edge in edges} - node_ids
+    missing_targets = {edge.target_id for edge in edges} - node_ids
+    
     # Validate nodes
-    for i, node in enumerate(nodes):
+    invalid_nodes = (i for i, node in enumerate(nodes) if not (node.id and node.type))
+    for i in invalid_nodes:
+        node = nodes[i]
         if not node.id:
             errors.append(f"Node {i} has empty ID")
         if not node.type:
             errors.append(f"Node {i} ({node.id}) has empty type")
     
     # Validate edges
-    for i, edge in enumerate(edges):
+    invalid_edges = (
+        i for i, edge in enumerate(edges)
+        if not (edge.id and edge.type and edge.source_id and edge.target_id)
+        or edge.source_id in missing_sources
+        or edge.target_id in missing_targets
+    )
+    for i in invalid_edges:
+        edge = edges[i]
         if not edge.id:
             errors.append(f"Edge {i} has empty ID")
         if not edge.type:
@@ -461,9 +530,9 @@ def validate_graph_data(nodes: List[GraphNode], edges: List[GraphEdge]) -> List[
             errors.append(f"Edge {i} ({edge.id}) has empty target_id")
         
         # Check if referenced nodes exist
-        if edge.source_id and edge.source_id not in node_ids:
+        if edge.source_id and edge.source_id in missing_sources:
             errors.append(f"Edge {i} ({edge.id}) references non-existent source node: {edge.source_id}")
-        if edge.target_id and edge.target_id not in node_ids:
+        if edge.target_id and edge.target_id in missing_targets:
             errors.append(f"Edge {i} ({edge.id}) references non-existent target node: {edge.target_id}")
     
     return errors
@@ -489,8 +558,35 @@ class GraphExportFactory:
             raise ValueError(f"Unsupported export format: {format_type}. "
                            f"Supported formats: {list(cls._exporters.keys())}")
         
+        return cls._get_exporter(format_type)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_exporter(cls, format_type: str) -> BaseGraphExporter:
+        """Shared exporter instance per format (exporters hold no per-export state)"""
         return cls._exporters[format_type]()
     
+    @classmethod
+    def _export_one(cls,
+                    format_type: str,
+                    nodes: List[GraphNode],
+                    edges: List[GraphEdge],
+                    output_dir: Path,
+                    filename_prefix: str) -> Dict[str, str]:
+        """Export graph data to a single format under output_dir/format_type"""
+        try:
+            exporter = cls.create_exporter(format_type)
+            
+            return exporter.export_graph(
+                nodes=nodes,
+                edges=edges,
+                output_dir=output_dir / format_type,
+                filename_prefix=filename_prefix
+            )
+            
+        except Exception as e:
+            raise Exception(f"Export to {format_type} failed: {str(e)}")
+    
     @classmethod
     def export_extraction_results(cls, 
                                  extraction_results: Dict[str, Any],
@@ -520,25 +616,17 @@ class GraphExportFactory:
         if validation_errors:
             raise ValueError(f"Graph data validation failed: {'; '.join(validation_errors)}")
         
-        # Export to each format
-        results = {}
-        
-        for format_type in formats:
-            try:
-                exporter = cls.create_exporter(format_type)
-                format_output_dir = output_dir / format_type
-                
-                export_files = exporter.export_graph(
-                    nodes=nodes,
-                    edges=edges,
-                    output_dir=format_output_dir,
-                    filename_prefix=filename_prefix
-                )
-                
-                results[format_type] = export_files
-                
-            except Exception as e:
-                raise Exception(f"Export to {format_type} failed: {str(e)}")
+        # Formats write to disjoint directories, so export them concurrently
+        format_types = list(dict.fromkeys(formats))  # Same directory must not be written twice at once
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(format_types))) as executor:
+            futures = {
+                format_type: executor.submit(cls._export_one, format_type, nodes, edges,
+                                             output_dir, filename_prefix)
+                for format_type in format_types
+            }
+            # result() re-raises the first failure in format order
+            results = {format_type: future.result() for format_type, future in futures.items()}
         
         return results
 
@@ -564,22 +652,26 @@ def estimate_csv_size(nodes: List[GraphNode], edges: List[GraphEdge]) -> Dict[st
 
 def create_export_summary(nodes: List[GraphNode], edges: List[GraphEdge]) -> Dict[str, Any]:
     """Create summary statistics of exported data"""
-    # Count node types
-    node_types = {}
+    # Count node and edge types, noting source locations in the same pass
+    node_types = Counter()
+    edge_types = Counter()
+    has_source_locations = False
+    
     for node in nodes:
-        node_types[node.type] = node_types.get(node.type, 0) + 1
+        node_types[node.type] += 1
+        if not has_source_locations and node.source_location:
+            has_source_locations = True
     
-    # Count edge types  
-    edge_types = {}
     for edge in edges:
-        edge_types[edge.type] = edge_types.get(edge.type, 0) + 1
+        edge_types[edge.type] += 1
+        if not has_source_locations and edge.source_location:
+            has_source_locations = True
     
     return {
         "export_timestamp": datetime.now().isoformat(),
         "total_nodes": len(nodes),
         "total_edges": len(edges),
-        "node_types": node_types,
-        "edge_types": edge_types,
-        "has_source_locations": any(node.source_location for node in nodes) or 
-                               any(edge.source_location for edge in edges)
+        "node_types": dict(node_types),
+        "edge_types": dict(edge_types),
+        "has_source_locations": has_source_locations
     }
\ No newline at end of file
@@ -3,12 +3,17 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import magic
 import mimetypes
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import hashlib
 import os
+import mmap
+import codecs
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 
 # Document processing libraries
 try:
@@ -16,9 +21,28 @@ try:
 except ImportError:
     import fitz
 
+try:
+    # Optional fallback PDF parser
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer
+except ImportError:
+    pdfminer_extract_pages = None
+
+try:
+    import charset_normalizer  # Optional single-pass encoding detection
+except ImportError:
+    charset_normalizer = None
+
+try:
+    from markdown_it import MarkdownIt  # Token-stream markdown parser
+except ImportError:
+    MarkdownIt = None
+
 import docx  # python-docx for Word documents
-import markdown  # For markdown files
+import markdown  # For markdown files (fallback when markdown-it-py is missing)
 import re
+import io
+import html
 from datetime import datetime
 
 # ============================================================================
@@ -48,6 +72,30 @@ MIN_FILE_SIZE = 1  # 1 byte
 MAX_TEXT_LENGTH = 10 * 1024 * 1024  # 10MB of text
 MIN_TEXT_LENGTH = 10  # 10 characters minimum
 
+# Encodings tried, in order, when decoding text and markdown files
+TEXT_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# Bytes sampled from the start of a text file to detect its encoding
+ENCODING_SNIFF_SIZE = 64 * 1024  # 64KB
+
+# Read size for file hashing on Pythons without hashlib.file_digest
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Window searched for the %PDF- header and the trailing %%EOF marker
+PDF_MARKER_WINDOW = 1024  # 1KiB
+
+# PDF page extraction parallelism. PyMuPDF is not thread-safe, so page ranges
+# go to worker processes; below this size process startup costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 32
+PDF_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Precompiled text cleanup patterns
+_WS_RE = re.compile(r'\s+')
+_MULTI_NL_RE = re.compile(r'\n{3,}')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_H1_BYTES_RE = re.compile(rb'^#[ \t]+(.+?)\r?$', re.MULTILINE)
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
 # ============================================================================
 # Data Classes
 # ============================================================================
@@ -84,7 +132,156 @@ class ValidationResult:
     """File validation result"""
     is_valid: bool
     error_message: Optional[str] = None
-    warnings: List[str] = None
+    warnings: Tuple[str, ...] = ()  # Immutable default shared by all results
+    encoding: Optional[str] = None  # Detected text encoding (text formats only)
+
+@dataclass
+class FileContext:
+    """
+    Per-file I/O cache shared by validation and processing
+    
+    Memoizes the stat result, the leading bytes, the SHA-256 hash and an
+    open PyMuPDF document so a file is stat'ed, hashed and opened once no
+    matter how many validators and extractors look at it. Whoever creates
+    the context owns it and must call close().
+    """
+    path: Path
+    _stat: Optional[os.stat_result] = field(default=None, repr=False)
+    _head: Optional[bytes] = field(default=None, repr=False)
+    _hash: Optional[str] = field(default=None, repr=False)
+    _pdf: Optional[Any] = field(default=None, repr=False)  # fitz.Document
+    
+    @property
+    def stat(self) -> os.stat_result:
+        """Cached os.stat() of the file"""
+        if self._stat is None:
+            self._stat = self.path.stat()
+        return self._stat
+    
+    @property
+    def head(self) -> bytes:
+        """Cached first ENCODING_SNIFF_SIZE bytes of the file"""
+        if self._head is None:
+            with open(self.path, 'rb') as f:
+                self._head = f.read(ENCODING_SNIFF_SIZE)
+        return self._head
+    
+    def open_pdf(self):
+        """Open the file with PyMuPDF once and reuse the document"""
+        if self._pdf is None:
+            self._pdf = fitz.open(str(self.path))
+        return self._pdf
+    
+    def close(self) -> None:
+        """Release the cached document handle"""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+# ============================================================================
+# Text Decoding Helpers
+# ============================================================================
+
+def _detect_encoding(head: bytes) -> Optional[str]:
+    """
+    Detect the encoding of a text sample
+    
+    Uses charset-normalizer when installed, otherwise the first entry of
+    TEXT_ENCODINGS that decodes the sample. Returns None if nothing fits.
+    """
+    if charset_normalizer is not None:
+        best_match = charset_normalizer.from_bytes(head).best()
+        if best_match is not None:
+            encoding = codecs.lookup(best_match.encoding).name
+            # ASCII is a subset of UTF-8; report the broader encoding
+            return 'utf-8' if encoding == 'ascii' else encoding
+    
+    for encoding in TEXT_ENCODINGS:
+        try:
+            # Incremental decode tolerates a multi-byte character cut off at the end
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    
+    return None
+
+def _decode_text_file(file_path: Path, encoding: Optional[str] = None) -> Optional[str]:
+    """
+    Decode a text file, trying `encoding` first and then TEXT_ENCODINGS
+    
+    The file is memory-mapped once and every attempt decodes from the same
+    mapping, so a failed encoding does not re-read the file from disk. When
+    validation already detected the encoding this is a single decode.
+    Returns None if no encoding can decode the file.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A UTF-8 BOM settles the encoding (and is stripped from the text)
+            if mm[:3] == codecs.BOM_UTF8:
+                encodings = ['utf-8-sig']
+            elif encoding:
+                encodings = [encoding] + [e for e in TEXT_ENCODINGS if e != encoding]
+            else:
+                encodings = TEXT_ENCODINGS
+            
+            for candidate in encodings:
+                try:
+                    return str(mm, candidate)
+                except UnicodeDecodeError:
+                    continue
+    
+    return None
+
+# WordprocessingML element tags used by the streaming DOCX extractor
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = f'{_W_NS}p'
+_W_R = f'{_W_NS}r'
+_W_T = f'{_W_NS}t'
+_W_TBL = f'{_W_NS}tbl'
+_W_TR = f'{_W_NS}tr'
+_W_TC = f'{_W_NS}tc'
+_W_RUN_BREAKS = {f'{_W_NS}tab': '\t', f'{_W_NS}br': '\n', f'{_W_NS}cr': '\n'}
+
+_MARKDOWN_PARSER = MarkdownIt() if MarkdownIt is not None else None
+
+# Inline token types whose content is document text
+_MARKDOWN_TEXT_TOKENS = {'text', 'code_inline'}
+_MARKDOWN_BREAK_TOKENS = {'softbreak', 'hardbreak'}
+
+def _markdown_to_text(markdown_content: str) -> str:
+    """
+    Convert markdown to plain text
+    
+    With markdown-it-py the token stream is walked directly and only text
+    content is kept, so no HTML is rendered and then stripped. Its text
+    tokens already hold decoded entities; only raw HTML blocks and the
+    Python-Markdown fallback (HTML with the tags removed) are unescaped.
+    """
+    if _MARKDOWN_PARSER is None:
+        html_content = markdown.Markdown().convert(markdown_content)
+        return html.unescape(_HTML_TAG_RE.sub('', html_content))
+    
+    buffer = io.StringIO()
+    for token in _MARKDOWN_PARSER.parse(markdown_content):
+        if token.type == 'inline':
+            for child in token.children or ():
+                if child.type in _MARKDOWN_TEXT_TOKENS:
+                    buffer.write(child.content)
+                elif child.type in _MARKDOWN_BREAK_TOKENS:
+                    buffer.write('\n')
+        elif token.type in ('fence', 'code_block'):
+            buffer.write(token.content)
+        elif token.type == 'html_block':
+            buffer.write(html.unescape(_HTML_TAG_RE.sub('', token.content)))
+        else:
+            continue
+        buffer.write('\n\n')
+    
+    return buffer.getvalue()
 
 # ============================================================================
 # File Validation Functions
@@ -94,10 +291,10 @@ class FileValidator:
     """Comprehensive file validation for security and format checking"""
     
     @staticmethod
-    def validate_file_size(file_path: Path) -> ValidationResult:
+    def validate_file_size(file_path: Path, context: Optional[FileContext] = None) -> ValidationResult:
         """Validate file size is within allowed limits"""
         try:
-            file_size = file_path.stat().st_size
+            file_size = (context or FileContext(file_path)).stat.st_size
             
             if file_size < MIN_FILE_SIZE:
                 return ValidationResult(
@@ -120,7 +317,7 @@ class FileValidator:
             )
     
     @staticmethod
-    def validate_file_type(file_path: Path) -> ValidationResult:
+    def validate_file_type(file_path: Path, context: Optional[FileContext] = None) -> ValidationResult:
         """Validate file type using multiple methods for security"""
         filename = file_path.name
         file_extension = file_path.suffix.lower()
@@ -136,8 +333,9 @@ class FileValidator:
         expected_mime_type = ALLOWED_EXTENSIONS[file_extension]
         
         try:
-            # Use python-magic for MIME type detection
-            detected_mime_type = magic.from_file(str(file_path), mime=True)
+            # Use python-magic for MIME type detection on the shared head bytes
+            head = (context or FileContext(file_path)).head
+            detected_mime_type = magic.from_buffer(head, mime=True)
             
             # Check if detected MIME type matches expected
             if detected_mime_type != expected_mime_type:
@@ -164,7 +362,7 @@ class FileValidator:
             
             return ValidationResult(
                 is_valid=True,
-                warnings=warnings
+                warnings=tuple(warnings)
             )
             
         except Exception as e:
@@ -176,7 +374,7 @@ class FileValidator:
                 
                 return ValidationResult(
                     is_valid=True,
-                    warnings=warnings
+                    warnings=tuple(warnings)
                 )
             except Exception as fallback_error:
                 return ValidationResult(
@@ -185,17 +383,24 @@ class FileValidator:
                 )
     
     @staticmethod
-    def validate_file_content(file_path: Path) -> ValidationResult:
-        """Validate file content for basic integrity"""
+    def validate_file_content(file_path: Path, context: Optional[FileContext] = None,
+                              deep: bool = False) -> ValidationResult:
+        """
+        Validate file content for basic integrity
+        
+        By default PDF and DOCX files only get structural checks; the full
+        parse happens once, in the processor. Pass deep=True to also open
+        the document here.
+        """
         file_extension = file_path.suffix.lower()
         
         try:
             if file_extension == '.pdf':
-                return FileValidator._validate_pdf_content(file_path)
+                return FileValidator._validate_pdf_content(file_path, context, deep)
             elif file_extension == '.docx':
-                return FileValidator._validate_docx_content(file_path)
+                return FileValidator._validate_docx_content(file_path, context, deep)
             elif file_extension in ['.txt', '.md']:
-                return FileValidator._validate_text_content(file_path)
+                return FileValidator._validate_text_content(file_path, context)
             else:
                 return ValidationResult(
                     is_valid=False,
@@ -209,10 +414,34 @@ class FileValidator:
             )
     
     @staticmethod
-    def _validate_pdf_content(file_path: Path) -> ValidationResult:
+    def _validate_pdf_content(file_path: Path, context: Optional[FileContext] = None,
+                              deep: bool = False) -> ValidationResult:
         """Validate PDF file content"""
+        owns_context = context is None
+        context = context or FileContext(file_path)
+        
         try:
-            doc = fitz.open(str(file_path))
+            # Structural check: %PDF- header near the start, %%EOF near the end
+            if b'%PDF-' not in context.head[:PDF_MARKER_WINDOW]:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message="PDF validation failed: missing %PDF- header"
+                )
+            
+            with open(file_path, 'rb') as f:
+                f.seek(max(0, context.stat.st_size - PDF_MARKER_WINDOW))
+                tail = f.read()
+            
+            if b'%%EOF' not in tail:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message="PDF validation failed: missing %%EOF trailer"
+                )
+            
+            if not deep:
+                return ValidationResult(is_valid=True)
+            
+            doc = context.open_pdf()
             
             if doc.page_count == 0:
                 return ValidationResult(
@@ -231,8 +460,6 @@ class FileValidator:
             first_page = doc[0]
             text = first_page.get_text()
             
-            doc.close()
-            
             return ValidationResult(is_valid=True)
             
         except Exception as e:
@@ -240,11 +467,34 @@ class FileValidator:
                 is_valid=False,
                 error_message=f"PDF validation failed: {str(e)}"
             )
+        finally:
+            if owns_context:
+                context.close()
     
     @staticmethod
-    def _validate_docx_content(file_path: Path) -> ValidationResult:
+    def _validate_docx_content(file_path: Path, context: Optional[FileContext] = None,
+                               deep: bool = False) -> ValidationResult:
         """Validate DOCX file content"""
         try:
+            # Structural check: a ZIP archive holding the main document part
+            if not (context or FileContext(file_path)).head.startswith(b'PK\x03\x04'):
+                return ValidationResult(
+                    is_valid=False,
+                    error_message="DOCX validation failed: not a ZIP archive"
+                )
+            
+            with zipfile.ZipFile(file_path) as archive:
+                try:
+                    archive.getinfo('word/document.xml')
+                except KeyError:
+                    return ValidationResult(
+                        is_valid=False,
+                        error_message="DOCX validation failed: missing word/document.xml"
+                    )
+            
+            if not deep:
+                return ValidationResult(is_valid=True)
+            
             doc = docx.Document(str(file_path))
             
             # Try to access document properties
@@ -262,38 +512,35 @@ class FileValidator:
             )
     
     @staticmethod
-    def _validate_text_content(file_path: Path) -> ValidationResult:
+    def _validate_text_content(file_path: Path, context: Optional[FileContext] = None) -> ValidationResult:
         """Validate text file content"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                # Try to read the first 1KB to check encoding
-                content = f.read(1024)
-                
-                if len(content) == 0:
-                    return ValidationResult(
-                        is_valid=False,
-                        error_message="Text file is empty"
-                    )
+            # Sample the start of the file to detect its encoding
+            head = (context or FileContext(file_path)).head
             
-            return ValidationResult(is_valid=True)
+            if len(head) == 0:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message="Text file is empty"
+                )
             
-        except UnicodeDecodeError:
-            # Try with different encodings
-            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        f.read(1024)
-                    return ValidationResult(
-                        is_valid=True,
-                        warnings=[f"File encoding detected as {encoding} instead of UTF-8"]
-                    )
-                except UnicodeDecodeError:
-                    continue
+            encoding = _detect_encoding(head)
+            
+            if encoding is None:
+                return ValidationResult(
+                    is_valid=False,
+                    error_message="Text file has unreadable encoding"
+                )
+            
+            if encoding != 'utf-8':
+                return ValidationResult(
+                    is_valid=True,
+                    warnings=(f"File encoding detected as {encoding} instead of UTF-8",),
+                    encoding=encoding
+                )
+            
+            return ValidationResult(is_valid=True, encoding=encoding)
             
-            return ValidationResult(
-                is_valid=False,
-                error_message="Text file has unreadable encoding"
-            )
         except Exception as e:
             return ValidationResult(
                 is_valid=False,
@@ -301,8 +548,9 @@ class FileValidator:
             )
     
     @classmethod
-    def validate_file(cls, file_path: Path) -> ValidationResult:
-        """Comprehensive file validation"""
+    def validate_file(cls, file_path: Path, context: Optional[FileContext] = None,
+                      deep: bool = False) -> ValidationResult:
+        """Comprehensive file validation (pass a FileContext to share I/O with processing)"""
         # Check if file exists
         if not file_path.exists():
             return ValidationResult(
@@ -317,29 +565,27 @@ class FileValidator:
             )
         
         # Validate file size
-        size_result = cls.validate_file_size(file_path)
+        size_result = cls.validate_file_size(file_path, context)
         if not size_result.is_valid:
             return size_result
         
         # Validate file type
-        type_result = cls.validate_file_type(file_path)
+        type_result = cls.validate_file_type(file_path, context)
         if not type_result.is_valid:
             return type_result
         
         # Validate content
-        content_result = cls.validate_file_content(file_path)
+        content_result = cls.validate_file_content(file_path, context, deep)
         if not content_result.is_valid:
             return content_result
         
         # Combine warnings
-        all_warnings = []
-        for result in [size_result, type_result, content_result]:
-            if result.warnings:
-                all_warnings.extend(result.warnings)
+        all_warnings = size_result.warnings + type_result.warnings + content_result.warnings
         
         return ValidationResult(
             is_valid=True,
-            warnings=all_warnings if all_warnings else None
+            warnings=all_warnings,
+            encoding=content_result.encoding
         )
 
 # ============================================================================
@@ -350,19 +596,21 @@ class DocumentProcessor(ABC):
     """Abstract base class for document processors"""
     
     @abstractmethod
-    def extract_text(self, file_path: Path) -> str:
-        """Extract text from document"""
+    def extract_text(self, file_path: Path, encoding: Optional[str] = None,
+                     context: Optional[FileContext] = None) -> str:
+        """Extract text from document (`encoding` is a hint for text formats)"""
         pass
     
     @abstractmethod
-    def extract_metadata(self, file_path: Path) -> DocumentMetadata:
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
         """Extract document metadata"""
         pass
     
-    def process_document(self, file_path: Path) -> ProcessedDocument:
+    def process_document(self, file_path: Path, encoding: Optional[str] = None,
+                         context: Optional[FileContext] = None) -> ProcessedDocument:
         """Process document to extract text and metadata"""
-        text = self.extract_text(file_path)
-        metadata = self.extract_metadata(file_path)
+        text = self.extract_text(file_path, encoding, context)
+        metadata = self.extract_metadata(file_path, context)
         
         # Add word count and character count to metadata
         metadata.word_count = len(text.split())
@@ -374,13 +622,24 @@ class DocumentProcessor(ABC):
         )
     
     @staticmethod
-    def calculate_file_hash(file_path: Path) -> str:
-        """Calculate SHA-256 hash of file"""
-        hash_sha256 = hashlib.sha256()
+    def calculate_file_hash(file_path: Path, context: Optional[FileContext] = None) -> str:
+        """Calculate SHA-256 hash of file (cached on the context when given)"""
+        if context is not None and context._hash is not None:
+            return context._hash
+        
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                file_hash = hashlib.file_digest(f, "sha256").hexdigest()
+            else:
+                # Large reads let OpenSSL's SHA-256 core amortize per-call overhead
+                hash_sha256 = hashlib.sha256()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hash_sha256.update(chunk)
+                file_hash = hash_sha256.hexdigest()
+        
+        if context is not None:
+            context._hash = file_hash
+        return file_hash
 
 # ============================================================================
 # Specific Document Processors
@@ -389,32 +648,55 @@ class DocumentProcessor(ABC):
 class PDFProcessor(DocumentProcessor):
     """PDF document processor using PyMuPDF"""
     
-    def extract_text(self, file_path: Path) -> str:
+    def extract_text(self, file_path: Path, encoding: Optional[str] = None,
+                     context: Optional[FileContext] = None) -> str:
         """Extract text from PDF using PyMuPDF"""
-        doc = fitz.open(str(file_path))
-        text_content = []
+        return "\n\n".join(self.extract_pages(file_path, context))
+    
+    def process_document(self, file_path: Path, encoding: Optional[str] = None,
+                         context: Optional[FileContext] = None) -> ProcessedDocument:
+        """
+        Extract pages, text and metadata from a single open document
+        
+        Falls back to pdfminer.six (when installed) for PDFs that PyMuPDF
+        cannot parse.
+        """
+        owns_context = context is None
+        context = context or FileContext(file_path)
         
         try:
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                
-                # Clean up the text
-                page_text = self._clean_pdf_text(page_text)
-                text_content.append(page_text)
-            
-            return "\n\n".join(text_content)
-            
+            # One page traversal yields both the per-page list and the text
+            pages = self.extract_pages(file_path, context)
+            metadata = self.extract_metadata(file_path, context)
+        except Exception:
+            if pdfminer_extract_pages is None or isinstance(self, PdfMinerProcessor):
+                raise
+            return PdfMinerProcessor().process_document(file_path, encoding, context)
         finally:
-            doc.close()
+            if owns_context:
+                context.close()
+        
+        text = "\n\n".join(pages)
+        # Pages are joined with whitespace, so per-page counts sum exactly and
+        # only one page's words are split into a list at a time
+        metadata.word_count = sum(len(page.split()) for page in pages)
+        metadata.character_count = len(text)
+        
+        return ProcessedDocument(
+            text=text,
+            metadata=metadata,
+            pages=pages
+        )
     
-    def extract_metadata(self, file_path: Path) -> DocumentMetadata:
-        """Extract PDF metadata"""
-        doc = fitz.open(str(file_path))
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
+        """Extract PDF metadata (reuses the context's open document when given)"""
+        owns_context = context is None
+        context = context or FileContext(file_path)
         
         try:
+            doc = context.open_pdf()
             metadata_dict = doc.metadata
-            file_stats = file_path.stat()
+            file_stats = context.stat
             
             # Convert PyMuPDF dates (if present)
             created_at = None
@@ -436,7 +718,7 @@ class PDFProcessor(DocumentProcessor):
                 filename=file_path.name,
                 file_size=file_stats.st_size,
                 mime_type='application/pdf',
-                file_hash=self.calculate_file_hash(file_path),
+                file_hash=self.calculate_file_hash(file_path, context),
                 created_at=created_at,
                 modified_at=modified_at or datetime.fromtimestamp(file_stats.st_mtime),
                 author=metadata_dict.get('author'),
@@ -448,42 +730,44 @@ class PDFProcessor(DocumentProcessor):
             )
             
         finally:
-            doc.close()
+            if owns_context:
+                context.close()
     
-    def extract_pages(self, file_path: Path) -> List[str]:
-        """Extract text per page"""
-        doc = fitz.open(str(file_path))
-        pages = []
+    def extract_pages(self, file_path: Path, context: Optional[FileContext] = None) -> List[str]:
+        """Extract text per page (reuses the context's open document when given)"""
+        owns_context = context is None
+        context = context or FileContext(file_path)
         
         try:
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
-                cleaned_text = self._clean_pdf_text(page_text)
-                pages.append(cleaned_text)
-            
-            return pages
-            
+            doc = context.open_pdf()
+            page_count = doc.page_count
+            if page_count < PDF_PARALLEL_MIN_PAGES or PDF_MAX_WORKERS < 2:
+                return [self._clean_pdf_text(doc[page_num].get_text("text"))
+                        for page_num in range(page_count)]
         finally:
-            doc.close()
+            if owns_context:
+                context.close()
+        
+        # Each worker process opens its own handle and extracts one contiguous range of pages
+        step = -(-page_count // PDF_MAX_WORKERS)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_extract_pdf_page_range, str(file_path), start, stop)
+                for start, stop in ranges
+            ]
+            # Collect in submission order to preserve page order
+            return [page_text for future in futures for page_text in future.result()]
     
     @staticmethod
     def _clean_pdf_text(text: str) -> str:
         """Clean extracted PDF text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove page numbers and headers/footers (simple heuristic)
-        lines = text.split('\n')
-        cleaned_lines = []
+        # Collapse all whitespace (including newlines) into single spaces
+        text = _WS_RE.sub(' ', text).strip()
         
-        for line in lines:
-            line = line.strip()
-            # Skip very short lines that might be page numbers
-            if len(line) > 3:
-                cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        # Skip very short pages that are likely just page numbers
+        return text if len(text) > 3 else ''
     
     @staticmethod
     def _parse_pdf_date(date_str: str) -> datetime:
@@ -496,10 +780,135 @@ class PDFProcessor(DocumentProcessor):
         date_part = date_str[:14]
         return datetime.strptime(date_part, '%Y%m%d%H%M%S')
 
+def _extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract cleaned text for pages [start, stop) in a worker process"""
+    doc = fitz.open(file_path)
+    
+    try:
+        return [PDFProcessor._clean_pdf_text(doc[page_num].get_text("text"))
+                for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+class PdfMinerProcessor(PDFProcessor):
+    """PDF processor using pdfminer.six (slower; fallback for PDFs PyMuPDF rejects)"""
+    
+    def extract_pages(self, file_path: Path, context: Optional[FileContext] = None) -> List[str]:
+        """Extract text per page with pdfminer's layout analysis"""
+        if pdfminer_extract_pages is None:
+            raise ValueError("pdfminer.six is not installed")
+        
+        return [
+            self._clean_pdf_text(''.join(element.get_text() for element in page
+                                         if isinstance(element, LTTextContainer)))
+            for page in pdfminer_extract_pages(str(file_path))
+        ]
+    
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
+        """Extract file-level PDF metadata (document info is only read by PyMuPDF)"""
+        context = context or FileContext(file_path)
+        file_stats = context.stat
+        
+        return DocumentMetadata(
+            filename=file_path.name,
+            file_size=file_stats.st_size,
+            mime_type='application/pdf',
+            file_hash=self.calculate_file_hash(file_path, context),
+            modified_at=datetime.fromtimestamp(file_stats.st_mtime)
+        )
+    
+    def process_document(self, file_path: Path, encoding: Optional[str] = None,
+                         context: Optional[FileContext] = None) -> ProcessedDocument:
+        """Extract pages, text and metadata with pdfminer"""
+        pages = self.extract_pages(file_path, context)
+        metadata = self.extract_metadata(file_path, context)
+        metadata.page_count = len(pages)
+        
+        text = "\n\n".join(pages)
+        metadata.word_count = sum(len(page.split()) for page in pages)
+        metadata.character_count = len(text)
+        
+        return ProcessedDocument(
+            text=text,
+            metadata=metadata,
+            pages=pages
+        )
+
 class DOCXProcessor(DocumentProcessor):
     """DOCX document processor using python-docx"""
     
-    def extract_text(self, file_path: Path) -> str:
+    def extract_text(self, file_path: Path, encoding: Optional[str] = None,
+                     context: Optional[FileContext] = None) -> str:
+        """Extract text from DOCX, streaming the document XML when possible"""
+        try:
+            return self._extract_text_streaming(file_path)
+        except (KeyError, zipfile.BadZipFile, ET.ParseError):
+            # Fall back to the python-docx object model
+            return self._extract_text_docx(file_path)
+    
+    @staticmethod
+    def _extract_text_streaming(file_path: Path) -> str:
+        """
+        Extract text by streaming word/document.xml with iterparse
+        
+        Produces the same layout as the python-docx path (body paragraphs,
+        then top-level tables with ' | ' between cells) without building
+        Paragraph/Run/Table/Cell objects. Elements are cleared once their
+        text has been captured to keep memory flat on large documents.
+        """
+        paragraphs = []  # Stripped, non-empty body paragraph text
+        tables = []  # Rendered text of top-level tables
+        paragraph_stack = []  # Text pieces of each open paragraph
+        table_stack = []  # Open tables as rows -> cells -> paragraph texts
+        run_depth = 0  # Tabs and breaks only count inside runs
+        
+        with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_stream:
+            for event, elem in ET.iterparse(xml_stream, events=('start', 'end')):
+                tag = elem.tag
+                
+                if event == 'start':
+                    if tag == _W_R:
+                        run_depth += 1
+                    elif tag == _W_P:
+                        paragraph_stack.append([])
+                    elif tag == _W_TBL:
+                        table_stack.append([])
+                    elif tag == _W_TR and table_stack:
+                        table_stack[-1].append([])
+                    elif tag == _W_TC and table_stack and table_stack[-1]:
+                        table_stack[-1][-1].append([])
+                    continue
+                
+                if tag == _W_T:
+                    if paragraph_stack:
+                        paragraph_stack[-1].append(elem.text or '')
+                elif tag == _W_R:
+                    run_depth -= 1
+                elif tag in _W_RUN_BREAKS:
+                    if run_depth and paragraph_stack:
+                        paragraph_stack[-1].append(_W_RUN_BREAKS[tag])
+                elif tag == _W_P:
+                    text = ''.join(paragraph_stack.pop())
+                    # Paragraphs nested in text boxes are not body text
+                    if not paragraph_stack:
+                        if table_stack:
+                            if table_stack[-1] and table_stack[-1][-1]:
+                                table_stack[-1][-1][-1].append(text)
+                        elif text.strip():
+                            paragraphs.append(text.strip())
+                    elem.clear()
+                elif tag == _W_TBL:
+                    rows = table_stack.pop()
+                    # Nested tables are skipped, matching python-docx cell.text
+                    if not table_stack:
+                        table_text = DOCXProcessor._render_table_rows(rows)
+                        if table_text:
+                            tables.append(table_text)
+                    elem.clear()
+        
+        return '\n\n'.join(paragraphs + tables)
+    
+    def _extract_text_docx(self, file_path: Path) -> str:
         """Extract text from DOCX using python-docx"""
         doc = docx.Document(str(file_path))
         text_content = []
@@ -517,17 +926,18 @@ class DOCXProcessor(DocumentProcessor):
         
         return '\n\n'.join(text_content)
     
-    def extract_metadata(self, file_path: Path) -> DocumentMetadata:
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
         """Extract DOCX metadata"""
+        context = context or FileContext(file_path)
         doc = docx.Document(str(file_path))
         props = doc.core_properties
-        file_stats = file_path.stat()
+        file_stats = context.stat
         
         return DocumentMetadata(
             filename=file_path.name,
             file_size=file_stats.st_size,
             mime_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            file_hash=self.calculate_file_hash(file_path),
+            file_hash=self.calculate_file_hash(file_path, context),
             created_at=props.created,
             modified_at=props.modified or datetime.fromtimestamp(file_stats.st_mtime),
             author=props.author,
@@ -536,6 +946,23 @@ class DOCXProcessor(DocumentProcessor):
             language=props.language
         )
     
+    @staticmethod
+    def _render_table_rows(rows: List[List[List[str]]]) -> str:
+        """Render streamed table rows (cells of paragraph texts) like _extract_table_text"""
+        table_text = []
+        
+        for row in rows:
+            row_text = []
+            for cell in row:
+                cell_text = '\n'.join(cell).strip()
+                if cell_text:
+                    row_text.append(cell_text)
+            
+            if row_text:
+                table_text.append(' | '.join(row_text))
+        
+        return '\n'.join(table_text)
+    
     @staticmethod
     def _extract_table_text(table) -> str:
         """Extract text from a DOCX table"""
@@ -556,31 +983,27 @@ class DOCXProcessor(DocumentProcessor):
 class TextProcessor(DocumentProcessor):
     """Plain text processor"""
     
-    def extract_text(self, file_path: Path) -> str:
+    def extract_text(self, file_path: Path, encoding: Optional[str] = None,
+                     context: Optional[FileContext] = None) -> str:
         """Extract text from plain text file"""
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+        content = _decode_text_file(file_path, encoding)
         
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                    # Clean up the text
-                    return self._clean_text(content)
-            except UnicodeDecodeError:
-                continue
+        if content is None:
+            raise ValueError("Could not decode text file with any supported encoding")
         
-        raise ValueError("Could not decode text file with any supported encoding")
+        # Clean up the text
+        return self._clean_text(content)
     
-    def extract_metadata(self, file_path: Path) -> DocumentMetadata:
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
         """Extract text file metadata"""
-        file_stats = file_path.stat()
+        context = context or FileContext(file_path)
+        file_stats = context.stat
         
         return DocumentMetadata(
             filename=file_path.name,
             file_size=file_stats.st_size,
             mime_type='text/plain',
-            file_hash=self.calculate_file_hash(file_path),
+            file_hash=self.calculate_file_hash(file_path, context),
             modified_at=datetime.fromtimestamp(file_stats.st_mtime)
         )
     
@@ -600,76 +1023,54 @@ class TextProcessor(DocumentProcessor):
         
         # Preserve paragraph breaks but remove excessive empty lines
         result = '\n'.join(cleaned_lines)
-        result = re.sub(r'\n{3,}', '\n\n', result)  # Max 2 consecutive newlines
+        result = _MULTI_NL_RE.sub('\n\n', result)  # Max 2 consecutive newlines
         
         return result.strip()
 
 class MarkdownProcessor(DocumentProcessor):
     """Markdown document processor"""
     
-    def extract_text(self, file_path: Path) -> str:
+    def extract_text(self, file_path: Path, encoding: Optional[str] = None,
+                     context: Optional[FileContext] = None) -> str:
         """Extract text from markdown file"""
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+        markdown_content = _decode_text_file(file_path, encoding)
         
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    markdown_content = f.read()
-                
-                # Convert markdown to plain text
-                md = markdown.Markdown()
-                html = md.convert(markdown_content)
-                
-                # Remove HTML tags to get plain text
-                plain_text = re.sub(r'<[^>]+>', '', html)
-                
-                # Clean up the text
-                return self._clean_markdown_text(plain_text)
-                
-            except UnicodeDecodeError:
-                continue
+        if markdown_content is None:
+            raise ValueError("Could not decode markdown file with any supported encoding")
         
-        raise ValueError("Could not decode markdown file with any supported encoding")
+        # Convert markdown to plain text
+        plain_text = _markdown_to_text(markdown_content)
+        
+        # Clean up the text
+        return self._clean_markdown_text(plain_text)
     
-    def extract_metadata(self, file_path: Path) -> DocumentMetadata:
+    def extract_metadata(self, file_path: Path, context: Optional[FileContext] = None) -> DocumentMetadata:
         """Extract markdown file metadata"""
-        file_stats = file_path.stat()
+        context = context or FileContext(file_path)
+        file_stats = context.stat
         
-        # Try to extract title from first heading
-        title = None
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                first_lines = f.read(1000)  # Read first 1KB
-                
-                # Look for first H1 heading
-                h1_match = re.search(r'^#\s+(.+)$', first_lines, re.MULTILINE)
-                if h1_match:
-                    title = h1_match.group(1).strip()
-        except:
-            pass
+        # Look for the first H1 heading in the first 1KB, decoding only the match
+        h1_match = _H1_BYTES_RE.search(context.head, 0, 1000)
+        title = h1_match.group(1).decode('utf-8', 'replace').strip() if h1_match else None
         
         return DocumentMetadata(
             filename=file_path.name,
             file_size=file_stats.st_size,
             mime_type='text/markdown',
-            file_hash=self.calculate_file_hash(file_path),
+            file_hash=self.calculate_file_hash(file_path, context),
             modified_at=datetime.fromtimestamp(file_stats.st_mtime),
             title=title
         )
     
     @staticmethod
     def _clean_markdown_text(text: str) -> str:
-        """Clean extracted markdown text"""
-        # Decode HTML entities
-        text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
-        
+        """Clean extracted markdown text (entities are already decoded)"""
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Normalize line endings and remove excessive newlines
         text = text.replace('\r\n', '\n').replace('\r', '\n')
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _MULTI_NL_RE.sub('\n\n', text)
         
         return text.strip()
 
@@ -680,37 +1081,63 @@ class MarkdownProcessor(DocumentProcessor):
 class DocumentProcessorFactory:
     """Factory class for creating appropriate document processors"""
     
+    # Processors keep no per-file state, so one shared instance per type suffices
     _processors = {
-        '.pdf': PDFProcessor,
-        '.docx': DOCXProcessor,
-        '.txt': TextProcessor,
-        '.md': MarkdownProcessor
+        '.pdf': PDFProcessor(),
+        '.docx': DOCXProcessor(),
+        '.txt': TextProcessor(),
+        '.md': MarkdownProcessor()
+    }
+    
+    # Selectable PDF parsers; PyMuPDF is much faster and falls back to pdfminer itself
+    _pdf_backends = {
+        'pymupdf': _processors['.pdf'],
+        'pdfminer': PdfMinerProcessor()
     }
     
     @classmethod
-    def get_processor(cls, file_path: Path) -> DocumentProcessor:
-        """Get appropriate processor for file type"""
-        file_extension = file_path.suffix.lower()
+    def get_processor(cls, file_path: Union[Path, str], backend: str = 'pymupdf') -> DocumentProcessor:
+        """Get appropriate processor for file type (`backend` picks the PDF parser)"""
+        # Lower-cased extension, without building a Path
+        file_extension = os.path.splitext(file_path)[1].lower()
         
         if file_extension not in cls._processors:
             raise ValueError(f"Unsupported file type: {file_extension}")
         
-        processor_class = cls._processors[file_extension]
-        return processor_class()
+        if file_extension == '.pdf':
+            if backend not in cls._pdf_backends:
+                raise ValueError(f"Unsupported PDF backend: {backend}. "
+                                 f"Supported backends: {list(cls._pdf_backends.keys())}")
+            return cls._pdf_backends[backend]
+        
+        return cls._processors[file_extension]
+    
+    @classmethod
+    def process_file(cls, file_path: Path, backend: str = 'pymupdf') -> Tuple[ProcessedDocument, ValidationResult]:
+        """Complete file processing with validation (`backend` picks the PDF parser)"""
+        # One context per file: stat, hash and the open PDF are shared by
+        # validation and extraction
+        context = FileContext(file_path)
+        
+        try:
+            return cls._process_file(file_path, context, backend)
+        finally:
+            context.close()
     
     @classmethod
-    def process_file(cls, file_path: Path) -> Tuple[ProcessedDocument, ValidationResult]:
-        """Complete file processing with validation"""
+    def _process_file(cls, file_path: Path, context: FileContext,
+                      backend: str = 'pymupdf') -> Tuple[ProcessedDocument, ValidationResult]:
+        """Validate and process a file using a shared FileContext"""
         # Validate file first
-        validation_result = FileValidator.validate_file(file_path)
+        validation_result = FileValidator.validate_file(file_path, context)
         
         if not validation_result.is_valid:
             return None, validation_result
         
         # Process file
         try:
-            processor = cls.get_processor(file_path)
-            processed_doc = processor.process_document(file_path)
+            processor = cls.get_processor(file_path, backend)
+            processed_doc = processor.process_document(file_path, validation_result.encoding, context)
             
             # Additional text validation
             if len(processed_doc.text) < MIN_TEXT_LENGTH:
@@ -761,7 +1188,7 @@ def estimate_processing_time(file_size: int) -> float:
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage"""
     # Remove or replace dangerous characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = _UNSAFE_FILENAME_RE.sub('_', filename)
     
     # Remove leading/trailing spaces and dots
     sanitized = sanitized.strip(' .')
@@ -2,13 +2,100 @@
 # Complete agent workflow definitions for ontology creation and data extraction
 
 from langgraph import StateGraph, END
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Tuple, Iterator, Callable
 from pydantic import BaseModel
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+import httpx
+import asyncio
+import hashlib
 import json
+import os
 import re
+import sqlite3
+import tempfile
+import time
+import uuid
+import weakref
+from pathlib import Path
+from functools import lru_cache
+from collections import defaultdict
 from datetime import datetime
 
+try:
+    import orjson  # Faster JSON for LLM responses and prompt payloads
+except ImportError:
+    orjson = None
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+# Maximum number of Claude requests in flight at once (Anthropic rate limits);
+# overridable with LLM_CONCURRENCY
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+
+# Exact-match LLM response cache (enabled with ANTHROPIC_CACHE_ENABLED=1)
+LLM_CACHE_PATH = "data/llm_cache.sqlite3"  # Overridable with LLM_CACHE_PATH
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days; temperature 0 entries never expire
+
+# Message Batches API (ANTHROPIC_BATCH_ENABLED=1): half the cost, minutes of latency,
+# so only used when a node has at least LLM_BATCH_THRESHOLD requests to send
+LLM_BATCH_THRESHOLD = 50
+LLM_BATCH_POLL_SECONDS = 10
+
+# Chunks sent together in one ontology extraction request
+ONTOLOGY_BATCH_SIZE = 6
+
+# Versions of the extraction prompts; bumping one invalidates its cached per-chunk results
+ONTOLOGY_PROMPT_VERSION = "ontology-joint-v1"
+DATA_EXTRACTION_PROMPT_VERSION = "data-extraction-v2"
+
+# Markdown-fenced JSON in LLM responses
+_JSON_FENCE_RE = re.compile(r'```json\n(.*?)\n```', re.DOTALL)
+
+# ============================================================================
+# JSON Helpers
+# ============================================================================
+
+def _json_loads(data: str) -> Any:
+    """Parse JSON with orjson when available (its errors subclass json.JSONDecodeError)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _parse_llm_json(response: str) -> Any:
+    """
+    Parse JSON from an LLM response, bare or inside a ```json fence
+    
+    Responses that start with a fence skip the doomed direct parse (and
+    its exception); bare JSON skips the regex. Raises ValueError (or its
+    subclass json.JSONDecodeError) when no valid JSON is found.
+    """
+    text = response.lstrip()
+    if text[:1] in ("[", "{"):
+        try:
+            return _json_loads(text)
+        except json.JSONDecodeError:
+            pass  # e.g. trailing commentary; fall back to the fence search
+    
+    json_match = _JSON_FENCE_RE.search(response)
+    if json_match:
+        return _json_loads(json_match.group(1))
+    
+    raise ValueError("Invalid JSON response from LLM")
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to 2-space indented JSON for prompts, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+def _json_dumps_compact(obj: Any) -> str:
+    """Serialize to JSON without insignificant whitespace (fewer prompt tokens)"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 # ============================================================================
 # State Definitions for Agent Workflows
 # ============================================================================
@@ -19,22 +106,25 @@ class OntologyCreationState(TypedDict):
     document_text: str
     document_id: str
     user_id: str
+    run_id: str  # Identifies this run in the request-progress registry
     chunk_size: int
     overlap_percentage: int
     
     # Processing state
-    document_chunks: List[str]
-    chunk_metadata: List[Dict[str, Any]]
-    current_chunk_index: int
+    chunk_metadata: List[Dict[str, Any]]  # Chunk text and offsets (single source of truth)
     
     # Extraction results
     extracted_entities: List[Dict[str, Any]]
     extracted_relationships: List[Dict[str, Any]]
-    raw_extractions: List[Dict[str, Any]]  # Per-chunk results
     
     # Final output
     ontology_triples: List[Dict[str, Any]]
     
+    # Result sizes, recorded by the nodes that produce the lists
+    entities_count: int
+    relationships_count: int
+    triples_count: int
+    
     # Status tracking
     processing_complete: bool
     deduplication_complete: bool
@@ -47,24 +137,25 @@ class DataExtractionState(TypedDict):
     document_text: str
     document_id: str
     ontology_schema: Dict[str, Any]
+    extraction_system_prompt: List[str]  # Instructions + rendered schema, built once per run
     user_id: str
     extraction_id: str
     chunk_size: int
     overlap_percentage: int
     
     # Processing state
-    document_chunks: List[str]
-    chunk_metadata: List[Dict[str, Any]]
-    current_chunk_index: int
+    chunk_metadata: List[Dict[str, Any]]  # Chunk text and offsets (single source of truth)
     
     # Extraction results
     extracted_nodes: List[Dict[str, Any]]
     extracted_edges: List[Dict[str, Any]]
-    raw_extractions: List[Dict[str, Any]]  # Per-chunk results
+    spool_path: Optional[str]  # ExtractionSpool file holding extracted nodes/edges until deduplication
     
     # Post-processing
     processed_nodes: List[Dict[str, Any]]
     processed_edges: List[Dict[str, Any]]
+    nodes_count: int  # Recorded by deduplication
+    edges_count: int
     
     # Status tracking
     processing_complete: bool
@@ -76,12 +167,12 @@ class DataExtractionState(TypedDict):
 # LLM Prompt Templates
 # ============================================================================
 
-ONTOLOGY_ENTITY_EXTRACTION_PROMPT = """
-You are an expert knowledge engineer tasked with extracting entities from document text to create an ontology.
+ONTOLOGY_JOINT_EXTRACTION_SYSTEM = """
+You are an expert knowledge engineer tasked with extracting entity types and relationship types from document text to create an ontology.
 
-TASK: Analyze the following text chunk and extract ALL distinct entity types that appear in the content.
+TASK: Analyze the text chunks in the user message and extract ALL distinct entity types and ALL types of relationships between them that appear in any of the chunks.
 
-RULES:
+ENTITY RULES:
 1. Extract only the TYPES of entities, not specific instances
 2. Use singular form (e.g., "Person" not "People" or "Persons")
 3. Be specific but not overly granular (e.g., "Employee" rather than just "Person" if the context is professional)
@@ -94,51 +185,39 @@ PRIMITIVE TYPES:
 - float: Decimal numbers (prices, percentages, measurements)
 - boolean: True/false values (flags, status indicators)
 
-TEXT CHUNK:
-{text_chunk}
-
-Respond with a JSON array of entity definitions:
-[
-  {{
-    "entity_type": "Person",
-    "type_variations": ["Individual", "Employee", "Staff Member"],
-    "primitive_type": "string",
-    "examples": ["John Smith", "CEO", "Manager"]
-  }}
-]
-
-Focus on accuracy and completeness. Extract ALL entity types present in the text.
-"""
-
-ONTOLOGY_RELATIONSHIP_EXTRACTION_PROMPT = """
-You are an expert knowledge engineer tasked with extracting relationship types from document text to create an ontology.
-
-TASK: Analyze the following text chunk and extract ALL types of relationships between entities.
-
-RULES:
+RELATIONSHIP RULES:
 1. Extract only the TYPES of relationships, not specific instances
 2. Use descriptive relationship names (e.g., "works_for", "manages", "located_in")
 3. Include relationship variations (different ways to express the same relationship)
 4. Focus on meaningful connections, not trivial associations
 5. Use snake_case for relationship names
+6. Subject and object types must be entity types from the "entities" list
 
-TEXT CHUNK:
-{text_chunk}
-
-ENTITIES ALREADY IDENTIFIED:
-{entity_types}
+Respond with a single JSON object covering all chunks:
+{
+  "entities": [
+    {
+      "entity_type": "Person",
+      "type_variations": ["Individual", "Employee", "Staff Member"],
+      "primitive_type": "string",
+      "examples": ["John Smith", "CEO", "Manager"]
+    }
+  ],
+  "relationships": [
+    {
+      "relationship_type": "works_for",
+      "type_variations": ["employed_by", "works_at", "is_employed_by"],
+      "typical_subject_types": ["Person", "Employee"],
+      "typical_object_types": ["Organization", "Company"]
+    }
+  ]
+}
 
-Respond with a JSON array of relationship definitions:
-[
-  {{
-    "relationship_type": "works_for",
-    "type_variations": ["employed_by", "works_at", "is_employed_by"],
-    "typical_subject_types": ["Person", "Employee"],
-    "typical_object_types": ["Organization", "Company"]
-  }}
-]
+Focus on accuracy and completeness. Extract ALL entity types present in the text and the relationships that connect them.
+"""
 
-Focus on relationships that connect the identified entity types.
+ONTOLOGY_JOINT_EXTRACTION_USER = """TEXT CHUNKS:
+{text_chunk}
 """
 
 ONTOLOGY_TRIPLE_GENERATION_PROMPT = """
@@ -180,55 +259,53 @@ Respond with a JSON array of ontology triples:
 ]
 """
 
-DATA_EXTRACTION_PROMPT = """
+DATA_EXTRACTION_SYSTEM = """
 You are an expert data extraction specialist. Extract specific entity instances and their relationships from the text using the provided ontology schema.
 
-ONTOLOGY SCHEMA:
-{ontology_schema}
-
-TEXT CHUNK:
-{text_chunk}
-
-CHUNK LOCATION: {chunk_location}
-
-TASK: Extract actual entity instances and relationships that match the ontology schema.
+TASK: Extract actual entity instances and relationships from the text chunk in the user message that match the ontology schema.
 
 RULES:
 1. Extract SPECIFIC instances, not types (e.g., "John Smith" not "Person")
 2. Only extract entities that match the ontology entity types
 3. Only extract relationships that match the ontology relationship types
-4. Include the source location for each extracted item
-5. Ensure relationships connect valid entity instances
-6. Be precise with data types (convert numbers to appropriate types)
+4. Ensure relationships connect valid entity instances
+5. Be precise with data types (convert numbers to appropriate types)
 
 Respond with JSON in this exact format:
-{{
+{
   "nodes": [
-    {{
+    {
       "id": "unique_node_id",
       "type": "entity_type_from_ontology",
-      "properties": {{
+      "properties": {
         "name": "actual_value",
         "other_property": "value"
-      }},
-      "source_location": "page X, paragraph Y" or "line Z"
-    }}
+      }
+    }
   ],
   "relationships": [
-    {{
+    {
       "id": "unique_relationship_id",
       "type": "relationship_type_from_ontology",
       "source_id": "source_node_id",
       "target_id": "target_node_id",
-      "properties": {{}},
-      "source_location": "page X, paragraph Y" or "line Z"
-    }}
+      "properties": {}
+    }
   ]
-}}
+}
 
 Be thorough but precise. Only extract what is clearly present in the text.
 """
 
+# Per-run context, cached after the static system prompt
+DATA_EXTRACTION_SCHEMA_CONTEXT = """ONTOLOGY SCHEMA:
+{ontology_schema}
+"""
+
+DATA_EXTRACTION_USER = """TEXT CHUNK:
+{text_chunk}
+"""
+
 DEDUPLICATION_PROMPT = """
 You are an expert data curator tasked with deduplicating extracted entities and relationships.
 
@@ -256,90 +333,496 @@ Respond with deduplicated JSON in the same format as input.
 # Agent Node Functions
 # ============================================================================
 
+def _env_flag(name: str) -> bool:
+    """Read a boolean feature flag from the environment"""
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+class LLMCache:
+    """SQLite-backed cache of LLM responses keyed by SHA-256"""
+    
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "hash TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_results ("
+            "hash TEXT PRIMARY KEY, result BLOB NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        self.conn.commit()
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0, "result_hits": 0}
+    
+    @classmethod
+    def from_env(cls) -> Optional["LLMCache"]:
+        """Create the cache if ANTHROPIC_CACHE_ENABLED is set, otherwise None"""
+        if not _env_flag("ANTHROPIC_CACHE_ENABLED"):
+            return None
+        
+        return cls(path=os.getenv("LLM_CACHE_PATH", LLM_CACHE_PATH))
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str,
+                 system_prompt: Optional[List[str]] = None) -> str:
+        """Hash everything that determines the response"""
+        payload = json.dumps({"m": model, "t": temperature, "p": prompt, "s": system_prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str, expires: bool = True) -> Optional[str]:
+        """Return the cached response, ignoring entries older than the TTL when `expires`"""
+        row = self.conn.execute(
+            "SELECT response, created_at FROM llm_cache WHERE hash = ?", (key,)
+        ).fetchone()
+        
+        if row is None or (expires and time.time() - row[1] > self.ttl_seconds):
+            self.stats["misses"] += 1
+            return None
+        
+        self.stats["hits"] += 1
+        return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response, replacing any previous entry"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (hash, response, created_at) VALUES (?, ?, ?)",
+            (key, value, int(time.time()))
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def make_result_key(prompt_version: str, model: str, prompt: str,
+                        system_prompt: Optional[List[str]] = None) -> str:
+        """Hash a prompt under its prompt version and the model that answers it"""
+        payload = "|".join([prompt_version, model, *(system_prompt or ()), prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get_result(self, key: str) -> Optional[Any]:
+        """Return the parsed result stored for a prompt, if any"""
+        row = self.conn.execute(
+            "SELECT result FROM chunk_results WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        self.stats["result_hits"] += 1
+        return _json_loads(row[0])
+    
+    def set_result(self, key: str, result: Any) -> None:
+        """Store the parsed result for a prompt"""
+        payload = orjson.dumps(result) if orjson is not None else json.dumps(result)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO chunk_results (hash, result, created_at) VALUES (?, ?, ?)",
+            (key, payload, int(time.time()))
+        )
+        self.conn.commit()
+
 class LLMService:
     """Service for interacting with Claude Sonnet 4"""
     
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, cache: Optional[LLMCache] = None, use_batch_api: bool = False):
+        self.api_key = api_key
         self.model = "claude-sonnet-4-20250514"
         self.max_tokens = 4000
         self.temperature = 0.1
+        self.cache = cache
+        self.use_batch_api = use_batch_api
+        # Client and request slots per event loop: both bind to the loop that first
+        # uses them, so a later asyncio.run (or a test's fresh loop) gets its own
+        self._loop_resources = weakref.WeakKeyDictionary()  # loop -> (client, request slots)
     
-    async def generate_response(self, prompt: str) -> str:
-        """Generate response from Claude"""
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[{"role": "user", "content": prompt}]
+    def _resources(self) -> Tuple[AsyncAnthropic, asyncio.Semaphore]:
+        """Client and request slots for the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        resources = self._loop_resources.get(loop)
+        if resources is None:
+            # Pool sized to the request concurrency so keep-alive connections are reused
+            client = AsyncAnthropic(
+                api_key=self.api_key,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=LLM_MAX_CONCURRENCY,
+                        max_keepalive_connections=LLM_MAX_CONCURRENCY
+                    )
+                )
             )
-            return response.content[0].text
+            resources = self._loop_resources[loop] = (client, asyncio.Semaphore(LLM_MAX_CONCURRENCY))
+        return resources
+    
+    @property
+    def client(self) -> AsyncAnthropic:
+        return self._resources()[0]
+    
+    @property
+    def _request_slots(self) -> asyncio.Semaphore:
+        """
+        Service-wide bound on API calls in flight, shared by every node and
+        workflow using this service on the loop; cache hits do not take a slot
+        """
+        return self._resources()[1]
+    
+    async def generate_response(self, prompt: str, system_prompt: Optional[List[str]] = None) -> str:
+        """
+        Generate response from Claude, serving repeats from the cache
+        
+        `system_prompt` holds the static instruction blocks shared by many
+        requests. Each block is marked for Anthropic prompt caching, so
+        after the first request the prefix is read from the server-side
+        cache instead of being processed again.
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = LLMCache.make_key(self.model, self.temperature, prompt, system_prompt)
+            # Deterministic (temperature 0) responses never go stale
+            expires = self.temperature != 0
+            cached = self.cache.get(cache_key, expires=expires)
+            if cached is not None:
+                return cached
+        
+        try:
+            async with self._request_slots:
+                response = await self.client.messages.create(**self._request_params(prompt, system_prompt))
+            text = response.content[0].text
         except Exception as e:
             raise Exception(f"LLM generation failed: {str(e)}")
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, text)
+        return text
+    
+    def _request_params(self, prompt: str, system_prompt: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Messages API parameters for one prompt"""
+        params = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            params["system"] = [
+                {"type": "text", "text": block, "cache_control": {"type": "ephemeral"}}
+                for block in system_prompt
+            ]
+        return params
+    
+    async def generate_batch(self, prompts: List[str],
+                             system_prompt: Optional[List[str]] = None) -> List[Any]:
+        """
+        Generate responses through the Message Batches API
+        
+        Exact cache hits are served directly and only the rest are
+        submitted, as one batch that is polled until it ends. Results come
+        back in prompt order; a request that did not succeed yields an
+        exception in place of the response.
+        """
+        responses: List[Any] = [None] * len(prompts)
+        keys: List[Optional[str]] = [None] * len(prompts)
+        if self.cache is not None:
+            expires = self.temperature != 0
+            for i, prompt in enumerate(prompts):
+                keys[i] = LLMCache.make_key(self.model, self.temperature, prompt, system_prompt)
+                responses[i] = self.cache.get(keys[i], expires=expires)
+        
+        pending = [i for i, response in enumerate(responses) if response is None]
+        if not pending:
+            return responses
+        
+        try:
+            batch = await self.client.messages.batches.create(requests=[
+                {"custom_id": str(i), "params": self._request_params(prompts[i], system_prompt)}
+                for i in pending
+            ])
+            while batch.processing_status != "ended":
+                await asyncio.sleep(LLM_BATCH_POLL_SECONDS)
+                batch = await self.client.messages.batches.retrieve(batch.id)
+            
+            for i in pending:
+                responses[i] = Exception("LLM generation failed: no batch result")
+            async for entry in await self.client.messages.batches.results(batch.id):
+                i = int(entry.custom_id)
+                if entry.result.type != "succeeded":
+                    responses[i] = Exception(f"LLM generation failed: batch request {entry.result.type}")
+                    continue
+                
+                responses[i] = entry.result.message.content[0].text
+                if keys[i] is not None:
+                    self.cache.set(keys[i], responses[i])
+        except Exception as e:
+            raise Exception(f"LLM batch generation failed: {str(e)}")
+        
+        return responses
+    
+    async def generate_responses(self, prompts: List[str],
+                                 system_prompt: Optional[List[str]] = None,
+                                 max_concurrency: int = LLM_MAX_CONCURRENCY,
+                                 on_response: Optional[Callable[[int, Any], None]] = None) -> List[Any]:
+        """
+        Generate responses for many prompts concurrently
+        
+        Results come back in prompt order. A failed request yields its
+        exception in place of the response so callers decide how to react.
+        `on_response(index, response)` is called as each one completes, so
+        callers can process early responses while later ones are in flight;
+        the responses are then not kept, and the first exception raised by
+        the callback is re-raised once all requests have finished.
+        Large request sets go through the Message Batches API when enabled.
+        """
+        if self.use_batch_api and len(prompts) >= LLM_BATCH_THRESHOLD:
+            responses = await self.generate_batch(prompts, system_prompt)
+            if on_response is None:
+                return responses
+            for index in range(len(responses)):
+                on_response(index, responses[index])
+                responses[index] = None  # Release each response once handed over
+            return responses
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        callback_errors: List[Exception] = []
+        
+        async def bounded(index: int, prompt: str) -> Any:
+            async with semaphore:
+                try:
+                    response = await self.generate_response(prompt, system_prompt)
+                except Exception as e:
+                    response = e
+            if on_response is None:
+                return response
+            try:
+                on_response(index, response)
+            except Exception as e:
+                callback_errors.append(e)
+            return None
+        
+        responses = await asyncio.gather(*(bounded(index, prompt)
+                                           for index, prompt in enumerate(prompts)),
+                                         return_exceptions=True)
+        if callback_errors:
+            raise callback_errors[0]
+        return responses
+    
+    async def generate_parsed(self, prompts: List[str], prompt_version: str,
+                              system_prompt: Optional[List[str]] = None,
+                              on_result: Optional[Callable[[int, Any], None]] = None) -> List[Any]:
+        """
+        Generate responses and parse their JSON, reusing results of unchanged prompts
+        
+        With the cache enabled, parsed results are stored per prompt under
+        `prompt_version` and the model, so a re-run only sends the prompts
+        whose text (or instructions) changed; prompts should therefore not
+        embed positional details such as chunk numbers. Results come back in prompt order; a
+        failed request or unparseable response yields its exception.
+        `on_result(index, result)` is called as each result becomes
+        available (cached results first), in completion order; results
+        handed to it are not kept, and an exception it raises fails the call.
+        """
+        results: List[Any] = [None] * len(prompts)
+        keys: List[Optional[str]] = [None] * len(prompts)
+        pending: List[int] = []
+        for i, prompt in enumerate(prompts):
+            cached = None
+            if self.cache is not None:
+                keys[i] = LLMCache.make_result_key(prompt_version, self.model, prompt, system_prompt)
+                cached = self.cache.get_result(keys[i])
+            if cached is None:
+                pending.append(i)
+            elif on_result is not None:
+                on_result(i, cached)
+            else:
+                results[i] = cached
+        
+        def parse(pending_index: int, response: Any) -> None:
+            i = pending[pending_index]
+            if isinstance(response, Exception):
+                result = response
+            else:
+                try:
+                    result = _parse_llm_json(response)
+                except ValueError as e:
+                    result = e
+                else:
+                    if keys[i] is not None:
+                        self.cache.set_result(keys[i], result)
+            
+            if on_result is not None:
+                on_result(i, result)  # Exceptions propagate to generate_responses
+            else:
+                results[i] = result
+        
+        await self.generate_responses(
+            [prompts[i] for i in pending],
+            system_prompt=system_prompt,
+            on_response=parse
+        )
+        
+        return results
+
+class ExtractionSpool:
+    """
+    Temporary SQLite file that extracted nodes and edges are streamed into
+    
+    Keeps per-chunk extraction results out of the workflow state so that
+    deduplication iterates a cursor instead of one list holding every
+    node and edge of the document.
+    """
+    
+    TABLES = ("nodes", "edges")
+    
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="extraction_", suffix=".sqlite3")
+            os.close(fd)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # Scratch data: durability is not needed
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        for table in self.TABLES:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "seq INTEGER PRIMARY KEY, chunk INTEGER NOT NULL, payload BLOB NOT NULL)"
+            )
+        self.conn.commit()
+    
+    def add(self, table: str, items: List[Dict[str, Any]], chunk: int = 0) -> None:
+        """Append a chunk's items to a table (chunks may arrive in any order)"""
+        dumps = orjson.dumps if orjson is not None else json.dumps
+        self.conn.executemany(
+            f"INSERT INTO {table} (chunk, payload) VALUES (?, ?)",
+            ((chunk, dumps(item)) for item in items)
+        )
+        self.conn.commit()
+    
+    def iter(self, table: str) -> Iterator[Dict[str, Any]]:
+        """Yield a table's items in chunk order, one row at a time"""
+        for (payload,) in self.conn.execute(f"SELECT payload FROM {table} ORDER BY chunk, seq"):
+            yield _json_loads(payload)
+    
+    def close(self, delete: bool = True) -> None:
+        """Close the connection and remove the file"""
+        self.conn.close()
+        if delete:
+            Path(self.path).unlink(missing_ok=True)
 
 class DocumentChunker:
     """Service for chunking documents with overlap"""
     
     @staticmethod
     def chunk_text(text: str, chunk_size: int = 1000, overlap_percentage: int = 10) -> List[Dict[str, Any]]:
-        """Split text into overlapping chunks with metadata"""
+        """
+        Split text into overlapping chunks with metadata
+        
+        Paragraph boundaries are located with str.find and chunks are
+        tracked as (start, end) offsets into `text`; each chunk's text is
+        a single slice of the original, so no intermediate strings are
+        built. paragraph_end is exclusive.
+        """
         overlap_size = int(chunk_size * overlap_percentage / 100)
         chunks = []
-        start = 0
-        chunk_id = 0
+        text_length = len(text)
         
-        # Split into paragraphs first for better context preservation
-        paragraphs = text.split('\n\n')
-        current_text = ""
-        current_paragraph = 0
+        # Paragraphs are separated by '\n\n' for better context preservation
+        chunk_start = chunk_end = 0  # Offsets of the current chunk; empty when equal
+        paragraph_start = 0
+        paragraph_index = 0
+        position = 0  # Offset of the current paragraph in text
         
-        for paragraph in paragraphs:
-            if len(current_text + paragraph) > chunk_size and current_text:
-                # Create chunk
+        while True:
+            paragraph_end = text.find('\n\n', position)
+            if paragraph_end == -1:
+                paragraph_end = text_length
+            
+            if chunk_end > chunk_start and chunk_end - chunk_start + 2 + paragraph_end - position > chunk_size:
                 chunks.append({
-                    "chunk_id": f"chunk_{chunk_id:04d}",
-                    "text": current_text.strip(),
-                    "start_char": start,
-                    "end_char": start + len(current_text),
-                    "paragraph_start": current_paragraph - current_text.count('\n\n'),
-                    "paragraph_end": current_paragraph
+                    "chunk_id": f"chunk_{len(chunks):04d}",
+                    "text": text[chunk_start:chunk_end].strip(),
+                    "start_char": chunk_start,
+                    "end_char": chunk_end,
+                    "paragraph_start": paragraph_start,
+                    "paragraph_end": paragraph_index
                 })
                 
-                # Prepare next chunk with overlap
-                if overlap_size > 0:
-                    overlap_text = current_text[-overlap_size:]
-                    current_text = overlap_text + paragraph
-                    start = start + len(current_text) - overlap_size
-                else:
-                    current_text = paragraph
-                    start = start + len(current_text)
-                
-                chunk_id += 1
-                current_paragraph += 1
-            else:
-                current_text += "\n\n" + paragraph if current_text else paragraph
-                current_paragraph += 1
+                # Next chunk starts with the tail of this one as overlap
+                chunk_start = chunk_end - min(overlap_size, chunk_end - chunk_start)
+                paragraph_start = paragraph_index
+            
+            if chunk_end > chunk_start:
+                chunk_end = paragraph_end
+            elif paragraph_end > position:
+                chunk_start, chunk_end = position, paragraph_end
+                paragraph_start = paragraph_index
+            
+            if paragraph_end == text_length:
+                break
+            position = paragraph_end + 2
+            paragraph_index += 1
         
         # Add final chunk
-        if current_text:
+        if chunk_end > chunk_start:
             chunks.append({
-                "chunk_id": f"chunk_{chunk_id:04d}",
-                "text": current_text.strip(),
-                "start_char": start,
-                "end_char": start + len(current_text),
-                "paragraph_start": current_paragraph - current_text.count('\n\n'),
-                "paragraph_end": current_paragraph
+                "chunk_id": f"chunk_{len(chunks):04d}",
+                "text": text[chunk_start:chunk_end].strip(),
+                "start_char": chunk_start,
+                "end_char": chunk_end,
+                "paragraph_start": paragraph_start,
+                "paragraph_end": paragraph_index + 1
             })
         
         return chunks
 
+_llm_service: Optional[LLMService] = None
+
+# [completed, total] LLM requests of each running extraction node, keyed by
+# run_id (ontology; one per run, so concurrent runs on a document stay apart)
+# or extraction_id (data). Updated on the event loop
+# as responses arrive, outside the LangGraph state, so no state writes or
+# checkpoints happen per chunk.
+_request_progress: Dict[str, List[int]] = {}
+
+def get_request_progress(run_id: str) -> Optional[int]:
+    """Percentage of a running extraction's LLM requests that have completed"""
+    counts = _request_progress.get(run_id)
+    if not counts or not counts[1]:
+        return None
+    return 100 * counts[0] // counts[1]
+
+def _track_requests(run_id: str, total: int) -> Callable[[int, Any], None]:
+    """Start tracking a run's requests; returns the per-completion callback"""
+    counts = _request_progress[run_id] = [0, total]
+    
+    def completed(index: int, result: Any) -> None:
+        counts[0] += 1
+    
+    return completed
+
+def get_llm_service() -> LLMService:
+    """Shared LLMService, so every node reuses one client and connection pool"""
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService(api_key=os.getenv("ANTHROPIC_API_KEY"), cache=LLMCache.from_env(),
+                                  use_batch_api=_env_flag("ANTHROPIC_BATCH_ENABLED"))
+    return _llm_service
+
+def _resolve_llm_service(config: Optional[Dict[str, Any]] = None) -> LLMService:
+    """LLMService injected through the LangGraph run config, else the shared one"""
+    llm_service = ((config or {}).get("configurable") or {}).get("llm_service")
+    return llm_service or get_llm_service()
+
+def _batch_chunks(chunks: List[str], batch_size: int = ONTOLOGY_BATCH_SIZE) -> List[str]:
+    """Combine consecutive chunks into labelled multi-chunk prompt sections"""
+    return [
+        "\n\n".join(f"CHUNK {offset}:\n{chunk}"
+                    for offset, chunk in enumerate(chunks[start:start + batch_size]))
+        for start in range(0, len(chunks), batch_size)
+    ]
+
 # ============================================================================
 # Ontology Creation Agent Functions
 # ============================================================================
 
-def chunk_document_node(state: OntologyCreationState) -> OntologyCreationState:
+def chunk_document_node(state: OntologyCreationState) -> Dict[str, Any]:
     """Chunk document with overlap for processing"""
+    updates: Dict[str, Any] = {}
     try:
         chunks_data = DocumentChunker.chunk_text(
             text=state["document_text"],
@@ -347,166 +830,134 @@ def chunk_document_node(state: OntologyCreationState) -> OntologyCreationState:
             overlap_percentage=state["overlap_percentage"]
         )
         
-        state["document_chunks"] = [chunk["text"] for chunk in chunks_data]
-        state["chunk_metadata"] = chunks_data
-        state["current_chunk_index"] = 0
-        state["progress_percentage"] = 10
+        updates["chunk_metadata"] = chunks_data
+        updates["progress_percentage"] = 10
         
     except Exception as e:
-        state["error_message"] = f"Document chunking failed: {str(e)}"
+        updates["error_message"] = f"Document chunking failed: {str(e)}"
     
-    return state
+    return updates
 
-def extract_entities_node(state: OntologyCreationState) -> OntologyCreationState:
-    """Extract entities from all chunks using Claude"""
+async def extract_entities_and_relationships_node(state: OntologyCreationState, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Extract entity and relationship types from all chunks in one Claude pass"""
+    updates: Dict[str, Any] = {}
     try:
-        llm_service = LLMService(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        llm_service = _resolve_llm_service(config)
         all_entities = []
+        all_relationships = []
         
-        for i, chunk in enumerate(state["document_chunks"]):
-            prompt = ONTOLOGY_ENTITY_EXTRACTION_PROMPT.format(text_chunk=chunk)
-            response = llm_service.generate_response(prompt)
-            
-            try:
-                entities = json.loads(response)
-                all_entities.extend(entities)
-            except json.JSONDecodeError:
-                # Extract JSON from response if wrapped in markdown
-                json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-                if json_match:
-                    entities = json.loads(json_match.group(1))
-                    all_entities.extend(entities)
-                else:
-                    raise ValueError("Invalid JSON response from LLM")
-            
-            # Update progress
-            progress = 20 + (30 * (i + 1) // len(state["document_chunks"]))
-            state["progress_percentage"] = progress
-        
-        state["extracted_entities"] = all_entities
-        state["progress_percentage"] = 50
+        # Several chunks per request, all requests at once; responses arrive in order
+        batches = _batch_chunks([chunk["text"] for chunk in state["chunk_metadata"]])
+        prompts = [ONTOLOGY_JOINT_EXTRACTION_USER.format(text_chunk=batch)
+                   for batch in batches]
+        results: List[Any] = [None] * len(prompts)
+        request_completed = _track_requests(state["run_id"], len(prompts))
         
-    except Exception as e:
-        state["error_message"] = f"Entity extraction failed: {str(e)}"
-    
-    return state
-
-def extract_relationships_node(state: OntologyCreationState) -> OntologyCreationState:
-    """Extract relationships from all chunks using Claude"""
-    try:
-        llm_service = LLMService(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        all_relationships = []
+        def collect(i: int, extraction: Any) -> None:
+            request_completed(i, extraction)
+            results[i] = extraction
         
-        # Prepare entity types for context
-        entity_types = [entity["entity_type"] for entity in state["extracted_entities"]]
-        entity_context = json.dumps(entity_types, indent=2)
+        await llm_service.generate_parsed(
+            prompts,
+            ONTOLOGY_PROMPT_VERSION,
+            system_prompt=[ONTOLOGY_JOINT_EXTRACTION_SYSTEM],
+            on_result=collect
+        )
         
-        for i, chunk in enumerate(state["document_chunks"]):
-            prompt = ONTOLOGY_RELATIONSHIP_EXTRACTION_PROMPT.format(
-                text_chunk=chunk,
-                entity_types=entity_context
-            )
-            response = llm_service.generate_response(prompt)
+        for extraction in results:
+            if isinstance(extraction, Exception):
+                raise extraction
             
-            try:
-                relationships = json.loads(response)
-                all_relationships.extend(relationships)
-            except json.JSONDecodeError:
-                json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-                if json_match:
-                    relationships = json.loads(json_match.group(1))
-                    all_relationships.extend(relationships)
-                else:
-                    raise ValueError("Invalid JSON response from LLM")
-            
-            # Update progress
-            progress = 50 + (20 * (i + 1) // len(state["document_chunks"]))
-            state["progress_percentage"] = progress
+            all_entities.extend(extraction.get("entities", []))
+            all_relationships.extend(extraction.get("relationships", []))
         
-        state["extracted_relationships"] = all_relationships
-        state["progress_percentage"] = 70
+        updates["extracted_entities"] = all_entities
+        updates["extracted_relationships"] = all_relationships
+        updates["progress_percentage"] = 70
         
     except Exception as e:
-        state["error_message"] = f"Relationship extraction failed: {str(e)}"
+        updates["error_message"] = f"Entity and relationship extraction failed: {str(e)}"
+    
+    return updates
+
+def _dedup_key(value: Any) -> str:
+    """Normalized text for exact-duplicate detection (trimmed, case-insensitive)"""
+    return str(value).strip().casefold()
+
+def _merge_type_definitions(definitions: List[Dict[str, Any]], type_key: str) -> List[Dict[str, Any]]:
+    """
+    Deduplicate type definitions by case-insensitive name in one pass
+    
+    The first definition of each type is kept and the type_variations of
+    all its duplicates are accumulated (in first-seen order), then
+    materialized once at the end.
+    """
+    merged = defaultdict(lambda: {"definition": None, "variations": {}})
+    
+    for definition in definitions:
+        slot = merged[_dedup_key(definition[type_key])]
+        if slot["definition"] is None:
+            slot["definition"] = definition
+        slot["variations"].update(dict.fromkeys(definition.get("type_variations", ())))
     
-    return state
+    return [
+        {**slot["definition"], "type_variations": list(slot["variations"])}
+        for slot in merged.values()
+    ]
 
-def deduplicate_ontology_node(state: OntologyCreationState) -> OntologyCreationState:
+def deduplicate_ontology_node(state: OntologyCreationState) -> Dict[str, Any]:
     """Deduplicate extracted entities and relationships"""
+    updates: Dict[str, Any] = {}
     try:
-        # Deduplicate entities by type name
-        unique_entities = {}
-        for entity in state["extracted_entities"]:
-            entity_type = entity["entity_type"].lower()
-            if entity_type not in unique_entities:
-                unique_entities[entity_type] = entity
-            else:
-                # Merge type variations
-                existing_variations = set(unique_entities[entity_type].get("type_variations", []))
-                new_variations = set(entity.get("type_variations", []))
-                unique_entities[entity_type]["type_variations"] = list(existing_variations | new_variations)
-        
-        # Deduplicate relationships by type name
-        unique_relationships = {}
-        for relationship in state["extracted_relationships"]:
-            rel_type = relationship["relationship_type"].lower()
-            if rel_type not in unique_relationships:
-                unique_relationships[rel_type] = relationship
-            else:
-                # Merge type variations
-                existing_variations = set(unique_relationships[rel_type].get("type_variations", []))
-                new_variations = set(relationship.get("type_variations", []))
-                unique_relationships[rel_type]["type_variations"] = list(existing_variations | new_variations)
-        
-        state["extracted_entities"] = list(unique_entities.values())
-        state["extracted_relationships"] = list(unique_relationships.values())
-        state["deduplication_complete"] = True
-        state["progress_percentage"] = 80
+        updates["extracted_entities"] = _merge_type_definitions(state["extracted_entities"], "entity_type")
+        updates["extracted_relationships"] = _merge_type_definitions(
+            state["extracted_relationships"], "relationship_type"
+        )
+        updates["entities_count"] = len(updates["extracted_entities"])
+        updates["relationships_count"] = len(updates["extracted_relationships"])
+        updates["deduplication_complete"] = True
+        updates["progress_percentage"] = 80
         
     except Exception as e:
-        state["error_message"] = f"Deduplication failed: {str(e)}"
+        updates["error_message"] = f"Deduplication failed: {str(e)}"
     
-    return state
+    return updates
 
-def create_ontology_triples_node(state: OntologyCreationState) -> OntologyCreationState:
+async def create_ontology_triples_node(state: OntologyCreationState, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Create final ontology triple structure"""
+    updates: Dict[str, Any] = {}
     try:
-        llm_service = LLMService(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        llm_service = _resolve_llm_service(config)
         
-        entities_json = json.dumps(state["extracted_entities"], indent=2)
-        relationships_json = json.dumps(state["extracted_relationships"], indent=2)
+        entities_json = _json_dumps(state["extracted_entities"])
+        relationships_json = _json_dumps(state["extracted_relationships"])
         
         prompt = ONTOLOGY_TRIPLE_GENERATION_PROMPT.format(
             entities=entities_json,
             relationships=relationships_json
         )
         
-        response = llm_service.generate_response(prompt)
+        response = await llm_service.generate_response(prompt)
         
-        try:
-            triples = json.loads(response)
-        except json.JSONDecodeError:
-            json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-            if json_match:
-                triples = json.loads(json_match.group(1))
-            else:
-                raise ValueError("Invalid JSON response from LLM")
+        triples = _parse_llm_json(response)
         
-        state["ontology_triples"] = triples
-        state["processing_complete"] = True
-        state["progress_percentage"] = 100
+        updates["ontology_triples"] = triples
+        updates["triples_count"] = len(triples)
+        updates["processing_complete"] = True
+        updates["progress_percentage"] = 100
         
     except Exception as e:
-        state["error_message"] = f"Triple creation failed: {str(e)}"
+        updates["error_message"] = f"Triple creation failed: {str(e)}"
     
-    return state
+    return updates
 
 # ============================================================================
 # Data Extraction Agent Functions
 # ============================================================================
 
-def chunk_document_extraction_node(state: DataExtractionState) -> DataExtractionState:
+def chunk_document_extraction_node(state: DataExtractionState) -> Dict[str, Any]:
     """Chunk document for data extraction"""
+    updates: Dict[str, Any] = {}
     try:
         chunks_data = DocumentChunker.chunk_text(
             text=state["document_text"],
@@ -514,79 +965,118 @@ def chunk_document_extraction_node(state: DataExtractionState) -> DataExtraction
             overlap_percentage=state["overlap_percentage"]
         )
         
-        state["document_chunks"] = [chunk["text"] for chunk in chunks_data]
-        state["chunk_metadata"] = chunks_data
-        state["current_chunk_index"] = 0
-        state["progress_percentage"] = 10
+        updates["chunk_metadata"] = chunks_data
+        updates["progress_percentage"] = 10
         
     except Exception as e:
-        state["error_message"] = f"Document chunking failed: {str(e)}"
+        updates["error_message"] = f"Document chunking failed: {str(e)}"
     
-    return state
+    return updates
 
-def extract_data_node(state: DataExtractionState) -> DataExtractionState:
+def _data_extraction_system_prompt(ontology_schema: Dict[str, Any]) -> List[str]:
+    """
+    System prompt blocks for data extraction: static instructions, then the schema
+    
+    Built once per run and bound to the ontology; per chunk only the short
+    user message is formatted. The schema is rendered compactly since it
+    is sent (or read from the prompt cache) with every chunk.
+    """
+    return [
+        DATA_EXTRACTION_SYSTEM,
+        DATA_EXTRACTION_SCHEMA_CONTEXT.format(ontology_schema=_json_dumps_compact(ontology_schema))
+    ]
+
+async def extract_data_node(state: DataExtractionState, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Extract actual data using ontology schema"""
+    updates: Dict[str, Any] = {}
+    spool = None
     try:
-        llm_service = LLMService(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        all_nodes = []
-        all_edges = []
+        llm_service = _resolve_llm_service(config)
+        spool = ExtractionSpool()
+        updates["spool_path"] = spool.path
         
-        ontology_json = json.dumps(state["ontology_schema"], indent=2)
+        system_prompt = (state.get("extraction_system_prompt")
+                         or _data_extraction_system_prompt(state["ontology_schema"]))
         
-        for i, chunk in enumerate(state["document_chunks"]):
-            chunk_metadata = state["chunk_metadata"][i]
-            location = f"chunk {i+1}, paragraphs {chunk_metadata['paragraph_start']}-{chunk_metadata['paragraph_end']}"
-            
-            prompt = DATA_EXTRACTION_PROMPT.format(
-                ontology_schema=ontology_json,
-                text_chunk=chunk,
-                chunk_location=location
-            )
-            
-            response = llm_service.generate_response(prompt)
-            
-            try:
-                extraction_result = json.loads(response)
-            except json.JSONDecodeError:
-                json_match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-                if json_match:
-                    extraction_result = json.loads(json_match.group(1))
-                else:
-                    continue  # Skip this chunk if parsing fails
+        # Prompts carry only the chunk text, so cached results survive edits that
+        # shift chunk or paragraph numbering; locations are stamped on afterwards
+        prompts = []
+        locations = []
+        for i, chunk_metadata in enumerate(state["chunk_metadata"]):
+            locations.append(f"chunk {i+1}, paragraphs {chunk_metadata['paragraph_start']}-{chunk_metadata['paragraph_end']}")
+            prompts.append(DATA_EXTRACTION_USER.format(text_chunk=chunk_metadata["text"]))
+        
+        errors = []
+        request_completed = _track_requests(state["extraction_id"], len(prompts))
+        
+        def spool_result(i: int, extraction_result: Any) -> None:
+            """Prefix a chunk's IDs, stamp its location and spill it while other chunks are in flight"""
+            request_completed(i, extraction_result)
+            if isinstance(extraction_result, ValueError):
+                return  # Skip this chunk if parsing fails
+            if isinstance(extraction_result, Exception):
+                errors.append(extraction_result)
+                return
             
             # Add chunk-specific IDs to avoid conflicts
-            for node in extraction_result.get("nodes", []):
+            location = locations[i]
+            nodes = extraction_result.get("nodes", [])
+            for node in nodes:
                 node["id"] = f"chunk_{i}_{node['id']}"
-                all_nodes.append(node)
+                node["source_location"] = location
             
-            for edge in extraction_result.get("relationships", []):
+            edges = extraction_result.get("relationships", [])
+            for edge in edges:
                 edge["id"] = f"chunk_{i}_{edge['id']}"
+                edge["source_location"] = location
                 edge["source_id"] = f"chunk_{i}_{edge['source_id']}"
                 edge["target_id"] = f"chunk_{i}_{edge['target_id']}"
-                all_edges.append(edge)
             
-            # Update progress
-            progress = 10 + (70 * (i + 1) // len(state["document_chunks"]))
-            state["progress_percentage"] = progress
+            # Spill to disk; only the deduplicated set is materialized later
+            spool.add("nodes", nodes, chunk=i)
+            spool.add("edges", edges, chunk=i)
         
-        state["extracted_nodes"] = all_nodes
-        state["extracted_edges"] = all_edges
-        state["progress_percentage"] = 80
+        await llm_service.generate_parsed(
+            prompts,
+            DATA_EXTRACTION_PROMPT_VERSION,
+            system_prompt=system_prompt,
+            on_result=spool_result
+        )
+        if errors:
+            raise errors[0]
+        
+        spool.close(delete=False)
+        updates["progress_percentage"] = 80
         
     except Exception as e:
-        state["error_message"] = f"Data extraction failed: {str(e)}"
+        updates["error_message"] = f"Data extraction failed: {str(e)}"
+        # A failed run never reaches deduplication, so drop its partial spool
+        if spool is not None:
+            spool.close(delete=True)
+            updates.pop("spool_path", None)
     
-    return state
+    return updates
 
-def deduplicate_data_node(state: DataExtractionState) -> DataExtractionState:
+def deduplicate_data_node(state: DataExtractionState) -> Dict[str, Any]:
     """Deduplicate extracted nodes and edges"""
+    updates: Dict[str, Any] = {}
+    spool = ExtractionSpool(state["spool_path"]) if state.get("spool_path") else None
     try:
+        if spool is not None:
+            extracted_nodes = spool.iter("nodes")
+            extracted_edges = spool.iter("edges")
+        else:
+            extracted_nodes = state["extracted_nodes"]
+            extracted_edges = state["extracted_edges"]
+        
         # Deduplicate nodes by name and type
         unique_nodes = {}
         node_id_mapping = {}
+        # Source locations per key, as insertion-ordered sets; joined once at the end
+        node_locations = defaultdict(dict)
         
-        for node in state["extracted_nodes"]:
-            node_key = f"{node['type']}_{node['properties'].get('name', '')}"
+        for node in extracted_nodes:
+            node_key = (_dedup_key(node["type"]), _dedup_key(node["properties"].get("name", "")))
             if node_key not in unique_nodes:
                 new_id = f"node_{len(unique_nodes):04d}"
                 unique_nodes[node_key] = {
@@ -595,29 +1085,28 @@ def deduplicate_data_node(state: DataExtractionState) -> DataExtractionState:
                 }
                 node_id_mapping[node["id"]] = new_id
             else:
-                # Merge properties and source locations
+                # Merge properties
                 existing_node = unique_nodes[node_key]
                 node_id_mapping[node["id"]] = existing_node["id"]
                 
-                # Merge properties
                 for key, value in node["properties"].items():
                     if key not in existing_node["properties"]:
                         existing_node["properties"][key] = value
-                
-                # Merge source locations
-                existing_location = existing_node.get("source_location", "")
-                new_location = node.get("source_location", "")
-                if new_location and new_location not in existing_location:
-                    combined_location = f"{existing_location}, {new_location}" if existing_location else new_location
-                    existing_node["source_location"] = combined_location
+            
+            if node.get("source_location"):
+                node_locations[node_key][node["source_location"]] = None
+        
+        for node_key, locations in node_locations.items():
+            unique_nodes[node_key]["source_location"] = ", ".join(locations)
         
         # Deduplicate edges and update node references
         unique_edges = {}
-        for edge in state["extracted_edges"]:
+        edge_locations = defaultdict(dict)
+        for edge in extracted_edges:
             new_source_id = node_id_mapping.get(edge["source_id"], edge["source_id"])
             new_target_id = node_id_mapping.get(edge["target_id"], edge["target_id"])
             
-            edge_key = f"{edge['type']}_{new_source_id}_{new_target_id}"
+            edge_key = (_dedup_key(edge["type"]), new_source_id, new_target_id)
             if edge_key not in unique_edges:
                 unique_edges[edge_key] = {
                     **edge,
@@ -625,25 +1114,29 @@ def deduplicate_data_node(state: DataExtractionState) -> DataExtractionState:
                     "source_id": new_source_id,
                     "target_id": new_target_id
                 }
-            else:
-                # Merge source locations
-                existing_edge = unique_edges[edge_key]
-                existing_location = existing_edge.get("source_location", "")
-                new_location = edge.get("source_location", "")
-                if new_location and new_location not in existing_location:
-                    combined_location = f"{existing_location}, {new_location}" if existing_location else new_location
-                    existing_edge["source_location"] = combined_location
-        
-        state["processed_nodes"] = list(unique_nodes.values())
-        state["processed_edges"] = list(unique_edges.values())
-        state["deduplication_complete"] = True
-        state["processing_complete"] = True
-        state["progress_percentage"] = 100
+            
+            if edge.get("source_location"):
+                edge_locations[edge_key][edge["source_location"]] = None
+        
+        for edge_key, locations in edge_locations.items():
+            unique_edges[edge_key]["source_location"] = ", ".join(locations)
+        
+        updates["processed_nodes"] = list(unique_nodes.values())
+        updates["processed_edges"] = list(unique_edges.values())
+        updates["nodes_count"] = len(unique_nodes)
+        updates["edges_count"] = len(unique_edges)
+        updates["deduplication_complete"] = True
+        updates["processing_complete"] = True
+        updates["progress_percentage"] = 100
         
     except Exception as e:
-        state["error_message"] = f"Data deduplication failed: {str(e)}"
+        updates["error_message"] = f"Data deduplication failed: {str(e)}"
+    finally:
+        if spool is not None:
+            spool.close()
+            updates["spool_path"] = None
     
-    return state
+    return updates
 
 # ============================================================================
 # Workflow Graph Definitions
@@ -655,15 +1148,13 @@ def create_ontology_creation_graph() -> StateGraph:
     
     # Add nodes
     graph.add_node("chunk_document", chunk_document_node)
-    graph.add_node("extract_entities", extract_entities_node)
-    graph.add_node("extract_relationships", extract_relationships_node)
+    graph.add_node("extract_ontology", extract_entities_and_relationships_node)
     graph.add_node("deduplicate", deduplicate_ontology_node)
     graph.add_node("create_triples", create_ontology_triples_node)
     
     # Define edges (workflow flow)
-    graph.add_edge("chunk_document", "extract_entities")
-    graph.add_edge("extract_entities", "extract_relationships")
-    graph.add_edge("extract_relationships", "deduplicate")
+    graph.add_edge("chunk_document", "extract_ontology")
+    graph.add_edge("extract_ontology", "deduplicate")
     graph.add_edge("deduplicate", "create_triples")
     graph.add_edge("create_triples", END)
     
@@ -695,47 +1186,80 @@ def create_data_extraction_graph() -> StateGraph:
 # Workflow Execution Functions
 # ============================================================================
 
+@lru_cache(maxsize=None)
+def _compiled_ontology_creation_graph():
+    """Ontology creation graph, compiled once; compiled graphs are reusable across runs"""
+    return create_ontology_creation_graph().compile()
+
+@lru_cache(maxsize=None)
+def _compiled_data_extraction_graph():
+    """Data extraction graph, compiled once; compiled graphs are reusable across runs"""
+    return create_data_extraction_graph().compile()
+
 async def execute_ontology_creation(
     document_text: str,
     document_id: str,
     user_id: str,
     chunk_size: int = 1000,
-    overlap_percentage: int = 10
+    overlap_percentage: int = 10,
+    llm_service: Optional[LLMService] = None,
+    run_id: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Execute ontology creation workflow"""
+    """
+    Execute ontology creation workflow
+    
+    `run_id` keys this run's request progress (see get_request_progress);
+    pass a unique id such as the ontology's to poll it, otherwise one is generated.
+    """
+    run_id = run_id or str(uuid.uuid4())
+    
+    # Nothing to chunk: skip the graph and the LLM round-trips entirely
+    if not document_text or document_text.isspace():
+        return {
+            "success": True,
+            "ontology_triples": [],
+            "entities_count": 0,
+            "relationships_count": 0,
+            "triples_count": 0,
+            "processing_complete": True,
+            "error_message": None
+        }
     
     # Initialize state
     initial_state: OntologyCreationState = {
         "document_text": document_text,
         "document_id": document_id,
         "user_id": user_id,
+        "run_id": run_id,
         "chunk_size": chunk_size,
         "overlap_percentage": overlap_percentage,
-        "document_chunks": [],
         "chunk_metadata": [],
-        "current_chunk_index": 0,
         "extracted_entities": [],
         "extracted_relationships": [],
-        "raw_extractions": [],
         "ontology_triples": [],
+        "entities_count": 0,
+        "relationships_count": 0,
+        "triples_count": 0,
         "processing_complete": False,
         "deduplication_complete": False,
         "error_message": None,
         "progress_percentage": 0
     }
     
-    # Create and execute workflow
-    workflow = create_ontology_creation_graph()
-    compiled_workflow = workflow.compile()
+    # Execute the shared compiled workflow; ainvoke keeps the event loop free
+    compiled_workflow = _compiled_ontology_creation_graph()
     
     try:
-        final_state = compiled_workflow.invoke(initial_state)
+        final_state = await compiled_workflow.ainvoke(
+            initial_state,
+            config={"configurable": {"llm_service": llm_service or get_llm_service()}}
+        )
         return {
             "success": True,
             "ontology_triples": final_state["ontology_triples"],
-            "entities_count": len(final_state["extracted_entities"]),
-            "relationships_count": len(final_state["extracted_relationships"]),
-            "triples_count": len(final_state["ontology_triples"]),
+            "entities_count": final_state["entities_count"],
+            "relationships_count": final_state["relationships_count"],
+            "triples_count": final_state["triples_count"],
             "processing_complete": final_state["processing_complete"],
             "error_message": final_state["error_message"]
         }
@@ -746,6 +1270,8 @@ async def execute_ontology_creation(
             "ontology_triples": [],
             "processing_complete": False
         }
+    finally:
+        _request_progress.pop(run_id, None)
 
 async def execute_data_extraction(
     document_text: str,
@@ -754,45 +1280,62 @@ async def execute_data_extraction(
     user_id: str,
     extraction_id: str,
     chunk_size: int = 1000,
-    overlap_percentage: int = 10
+    overlap_percentage: int = 10,
+    llm_service: Optional[LLMService] = None
 ) -> Dict[str, Any]:
     """Execute data extraction workflow"""
     
+    # Nothing to chunk: skip the graph and the LLM round-trips entirely
+    if not document_text or document_text.isspace():
+        return {
+            "success": True,
+            "nodes": [],
+            "edges": [],
+            "nodes_count": 0,
+            "relationships_count": 0,
+            "processing_complete": True,
+            "error_message": None
+        }
+    
     # Initialize state
     initial_state: DataExtractionState = {
         "document_text": document_text,
         "document_id": document_id,
         "ontology_schema": ontology_schema,
+        # Serialize the schema once; every chunk's request reuses these blocks
+        "extraction_system_prompt": _data_extraction_system_prompt(ontology_schema),
         "user_id": user_id,
         "extraction_id": extraction_id,
         "chunk_size": chunk_size,
         "overlap_percentage": overlap_percentage,
-        "document_chunks": [],
         "chunk_metadata": [],
-        "current_chunk_index": 0,
         "extracted_nodes": [],
         "extracted_edges": [],
-        "raw_extractions": [],
+        "spool_path": None,
         "processed_nodes": [],
         "processed_edges": [],
+        "nodes_count": 0,
+        "edges_count": 0,
         "processing_complete": False,
         "deduplication_complete": False,
         "error_message": None,
         "progress_percentage": 0
     }
     
-    # Create and execute workflow
-    workflow = create_data_extraction_graph()
-    compiled_workflow = workflow.compile()
+    # Execute the shared compiled workflow; ainvoke keeps the event loop free
+    compiled_workflow = _compiled_data_extraction_graph()
     
     try:
-        final_state = compiled_workflow.invoke(initial_state)
+        final_state = await compiled_workflow.ainvoke(
+            initial_state,
+            config={"configurable": {"llm_service": llm_service or get_llm_service()}}
+        )
         return {
             "success": True,
             "nodes": final_state["processed_nodes"],
             "edges": final_state["processed_edges"],
-            "nodes_count": len(final_state["processed_nodes"]),
-            "relationships_count": len(final_state["processed_edges"]),
+            "nodes_count": final_state["nodes_count"],
+            "relationships_count": final_state["edges_count"],
             "processing_complete": final_state["processing_complete"],
             "error_message": final_state["error_message"]
         }
@@ -804,6 +1347,5 @@ async def execute_data_extraction(
             "edges": [],
             "processing_complete": False
         }
-
-# Import statements at the top of the file
-import os
\ No newline at end of file
+    finally:
+        _request_progress.pop(extraction_id, None)
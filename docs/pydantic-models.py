@@ -1,11 +1,24 @@
 # DeepInsight Pydantic Models
 # Complete request/response validation schemas for FastAPI
 
-from pydantic import BaseModel, Field, field_validator, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, EmailStr
+from typing import List, Optional, Dict, Any, Union, FrozenSet
 from enum import Enum
 from datetime import datetime
+from dataclasses import dataclass
+import asyncio
 import re
+import string
+
+# Validator patterns, compiled once at import
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+_TYPE_NAME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9_\s]*$')  # Entity and relationship types
+
+# Password character classes, checked against set(password) in C
+_PW_UPPER = frozenset(string.ascii_uppercase)
+_PW_LOWER = frozenset(string.ascii_lowercase)
+_PW_DIGIT = frozenset(string.digits)
+_PW_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
 
 # ============================================================================
 # Enums for Status Values
@@ -46,42 +59,41 @@ class UserRegisterRequest(BaseModel):
     
     @field_validator('username')
     def validate_username(cls, v):
-        if not re.match(r'^[a-zA-Z0-9_]+$', v):
+        if not _USERNAME_RE.match(v):
             raise ValueError('Username can only contain letters, numbers, and underscores')
         return v
     
     @field_validator('password')
     def validate_password(cls, v):
-        if not re.search(r'[A-Z]', v):
+        chars = set(v)
+        if chars.isdisjoint(_PW_UPPER):
             raise ValueError('Password must contain at least one uppercase letter')
-        if not re.search(r'[a-z]', v):
+        if chars.isdisjoint(_PW_LOWER):
             raise ValueError('Password must contain at least one lowercase letter')
-        if not re.search(r'[0-9]', v):
+        if chars.isdisjoint(_PW_DIGIT):
             raise ValueError('Password must contain at least one number')
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
+        if chars.isdisjoint(_PW_SPECIAL):
             raise ValueError('Password must contain at least one special character')
         return v
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "username": "john_doe",
-                "email": "john@example.com",
-                "password": "SecurePass123!"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "username": "john_doe",
+            "email": "john@example.com",
+            "password": "SecurePass123!"
         }
+    })
 
 class UserLoginRequest(BaseModel):
     username: str
     password: str
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "username": "john_doe",
-                "password": "SecurePass123!"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "username": "john_doe",
+            "password": "SecurePass123!"
         }
+    })
 
 class UserResponse(BaseModel):
     id: str
@@ -89,8 +101,7 @@ class UserResponse(BaseModel):
     email: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AuthResponse(BaseModel):
     access_token: str
@@ -113,8 +124,7 @@ class DocumentResponse(BaseModel):
     processed_at: Optional[datetime] = None
     error_message: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DocumentListResponse(BaseModel):
     documents: List[DocumentResponse]
@@ -122,6 +132,9 @@ class DocumentListResponse(BaseModel):
     page: int
     limit: int
 
+# Serializes large document lists in one pydantic-core call (adapter.dump_json(docs))
+DOCUMENT_LIST_ADAPTER = TypeAdapter(List[DocumentResponse])
+
 class DocumentStatusResponse(BaseModel):
     document_id: str
     status: DocumentStatus
@@ -139,7 +152,7 @@ class EntityDefinition(BaseModel):
     
     @field_validator('entity_type')
     def validate_entity_type(cls, v):
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_\s]*$', v):
+        if not _TYPE_NAME_RE.match(v):
             raise ValueError('Entity type must start with a letter and contain only letters, numbers, underscores, and spaces')
         return v.strip()
     
@@ -153,7 +166,7 @@ class RelationshipDefinition(BaseModel):
     
     @field_validator('relationship_type')
     def validate_relationship_type(cls, v):
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_\s]*$', v):
+        if not _TYPE_NAME_RE.match(v):
             raise ValueError('Relationship type must start with a letter and contain only letters, numbers, underscores, and spaces')
         return v.strip()
     
@@ -166,25 +179,27 @@ class OntologyTriple(BaseModel):
     relationship: RelationshipDefinition
     object: EntityDefinition
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "subject": {
-                    "entity_type": "Person",
-                    "type_variations": ["Employee", "Individual"],
-                    "primitive_type": "string"
-                },
-                "relationship": {
-                    "relationship_type": "works_for",
-                    "type_variations": ["is_employed_by", "employed_at"]
-                },
-                "object": {
-                    "entity_type": "Organization",
-                    "type_variations": ["Company", "Employer"],
-                    "primitive_type": "string"
-                }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "subject": {
+                "entity_type": "Person",
+                "type_variations": ["Employee", "Individual"],
+                "primitive_type": "string"
+            },
+            "relationship": {
+                "relationship_type": "works_for",
+                "type_variations": ["is_employed_by", "employed_at"]
+            },
+            "object": {
+                "entity_type": "Organization",
+                "type_variations": ["Company", "Employer"],
+                "primitive_type": "string"
             }
         }
+    })
+
+# Validates whole triple lists inside pydantic-core (see validate_triples_json)
+TRIPLES_ADAPTER = TypeAdapter(List[OntologyTriple])
 
 class OntologyCreateRequest(BaseModel):
     document_id: str
@@ -223,8 +238,7 @@ class OntologyResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class OntologyDetailResponse(OntologyResponse):
     triples: List[OntologyTriple]
@@ -248,8 +262,7 @@ class ExtractionResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ExtractionDetailResponse(ExtractionResponse):
     nodes_count: Optional[int] = None
@@ -326,7 +339,10 @@ class ErrorResponse(BaseModel):
 # Internal Processing Models (not exposed in API)
 # ============================================================================
 
-class ChunkMetadata(BaseModel):
+# Created per chunk and never validated from user input, so plain slotted
+# dataclasses; pydantic still accepts them as field types below
+@dataclass(slots=True, frozen=True)
+class ChunkMetadata:
     chunk_id: str
     start_char: int
     end_char: int
@@ -334,7 +350,8 @@ class ChunkMetadata(BaseModel):
     line_number: Optional[int] = None
     paragraph_number: Optional[int] = None
 
-class ProcessedChunk(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ProcessedChunk:
     text: str
     metadata: ChunkMetadata
 
@@ -372,12 +389,12 @@ class SecurityConfig(BaseModel):
 
 class FileUploadConfig(BaseModel):
     max_file_size: int = 100 * 1024 * 1024  # 100MB
-    allowed_mime_types: List[str] = [
+    allowed_mime_types: FrozenSet[str] = frozenset({
         "application/pdf",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "text/plain",
         "text/markdown"
-    ]
+    })
     upload_directory: str = "./data/documents"
 
 class AppConfig(BaseModel):
@@ -393,20 +410,27 @@ class AppConfig(BaseModel):
 # Validation Utilities
 # ============================================================================
 
+# Allowed (extension, MIME type) pairs for uploads
+_ALLOWED_FILE_TYPES = frozenset({
+    (".pdf", "application/pdf"),
+    (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (".txt", "text/plain"),
+    (".md", "text/markdown")
+})
+
 def validate_file_type(filename: str, mime_type: str) -> bool:
     """Validate file type based on filename and MIME type"""
-    allowed_extensions = {
-        ".pdf": "application/pdf",
-        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ".txt": "text/plain",
-        ".md": "text/markdown"
-    }
-    
-    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
-    file_ext = f'.{file_ext}'
-    
-    return file_ext in allowed_extensions and allowed_extensions[file_ext] == mime_type
+    _, dot, file_ext = filename.rpartition('.')
+    return bool(dot) and (f'.{file_ext.lower()}', mime_type) in _ALLOWED_FILE_TYPES
 
 def validate_file_size(file_size: int, max_size: int = 100 * 1024 * 1024) -> bool:
     """Validate file size (default max: 100MB)"""
-    return 0 < file_size <= max_size
\ No newline at end of file
+    return 0 < file_size <= max_size
+
+def validate_triples_json(data: Union[str, bytes]) -> List[OntologyTriple]:
+    """Parse and validate a JSON array of triples in a single pydantic-core pass"""
+    return TRIPLES_ADAPTER.validate_json(data)
+
+async def validate_triples_json_async(data: Union[str, bytes]) -> List[OntologyTriple]:
+    """Validate a large triple payload in a worker thread, off the event loop"""
+    return await asyncio.to_thread(validate_triples_json, data)
\ No newline at end of file
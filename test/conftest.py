@@ -0,0 +1,201 @@
+"""
+Shared fixtures for the extraction tests.
+
+The direct (no API) tests use fresh in-process objects. The integration tests share one
+logged-in session, uploaded document and processed ontology for the whole pytest run,
+and are skipped when `requests` is missing or the backend is not running. Their IDs are
+kept in the pytest cache so reruns reuse them; `pytest --cache-clear` forces a fresh setup.
+"""
+
+import sys
+import os
+import time
+import hashlib
+from pathlib import Path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+import pytest
+
+try:
+    import orjson  # Faster decoding of polled and result JSON
+except ImportError:
+    orjson = None
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder  # Streams uploads in chunks
+except ImportError:
+    MultipartEncoder = None
+
+from utils.enhanced_extraction import EntityRegistry, EnhancedExtractionProcessor
+
+BASE_URL = "http://localhost:8000"
+TEST_PDF_PATH = Path(__file__).parent / "testdata" / "test_doc.pdf"
+
+TEST_USER = {
+    "username": "test_enhanced_user",
+    "email": "enhanced_test@example.com",
+    "password": "TestPass123!"
+}
+
+# Status polling backoff: start fast so quick completions are seen at once, then back off
+POLL_INITIAL_INTERVAL = 0.25
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_INTERVAL = 5.0
+
+def response_json(response):
+    """Decode a JSON response body, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def poll_status(session, url, terminal_states, timeout):
+    """
+    GET `url` until its status is in `terminal_states` or `timeout` seconds pass.
+    Polls with exponential backoff; returns the final JSON body, or None on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    interval = POLL_INITIAL_INTERVAL
+    
+    while True:
+        try:
+            response = session.get(url)
+            if response.status_code == 200:
+                body = response_json(response)
+                if body["status"] in terminal_states:
+                    return body
+        except Exception:
+            pass
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+        interval = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "unit: in-process tests that need no backend")
+    config.addinivalue_line("markers", "integration: end-to-end tests against the running backend")
+
+@pytest.fixture
+def registry():
+    """Fresh EntityRegistry for each test"""
+    return EntityRegistry()
+
+@pytest.fixture
+def processor():
+    """Fresh EnhancedExtractionProcessor for each test"""
+    return EnhancedExtractionProcessor()
+
+@pytest.fixture(scope="session")
+def authed_session():
+    """Logged-in requests.Session shared by every integration test"""
+    requests = pytest.importorskip("requests")
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+    
+    session = requests.Session()
+    # Keep polling on one kept-alive connection; retry idempotent calls on gateway errors
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=16, pool_block=True,
+        max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    try:
+        session.get(f"{BASE_URL}/health", timeout=5)
+    except requests.RequestException:
+        session.close()
+        pytest.skip(f"Backend not reachable at {BASE_URL}")
+    
+    # Register, or log in if the user already exists
+    response = session.post(f"{BASE_URL}/auth/register", json=TEST_USER)
+    if response.status_code != 200:
+        response = session.post(f"{BASE_URL}/auth/login", json={
+            "username": TEST_USER["username"],
+            "password": TEST_USER["password"]
+        })
+    assert response.status_code == 200, f"Failed to login: {response.status_code}"
+    
+    session.headers.update({
+        "Authorization": f"Bearer {response_json(response)['access_token']}"
+    })
+    
+    yield session
+    session.close()
+
+def _cached_resource(session, cache, key, path, ready_status):
+    """Return the ID cached under `key` if the backend still has it in `ready_status`"""
+    resource_id = cache.get(key, None)
+    if resource_id is None:
+        return None
+    
+    try:
+        response = session.get(f"{BASE_URL}/{path}/{resource_id}")
+    except Exception:
+        return None
+    if response.status_code == 200 and response_json(response).get("status") == ready_status:
+        return resource_id
+    return None
+
+@pytest.fixture(scope="session")
+def backend_version(authed_session):
+    """Version reported by the backend health check, part of the setup cache keys"""
+    return response_json(authed_session.get(f"{BASE_URL}/health")).get("version", "unknown")
+
+@pytest.fixture(scope="session")
+def document_id(request, authed_session, backend_version):
+    """ID of the test PDF, uploaded and processed once and reused across runs"""
+    if not TEST_PDF_PATH.exists():
+        pytest.skip(f"Test file not found: {TEST_PDF_PATH}")
+    
+    digest = hashlib.sha256(TEST_PDF_PATH.read_bytes()).hexdigest()
+    cache_key = f"deepinsight/document/{digest}-{backend_version}"
+    document_id = _cached_resource(authed_session, request.config.cache, cache_key, "documents", "completed")
+    if document_id:
+        return document_id
+    
+    with open(TEST_PDF_PATH, 'rb') as f:
+        if MultipartEncoder is not None:
+            # Stream the file to the socket instead of buffering the whole multipart body
+            encoder = MultipartEncoder({'file': ('test_doc.pdf', f, 'application/pdf')})
+            response = authed_session.post(f"{BASE_URL}/documents/upload", data=encoder,
+                                           headers={'Content-Type': encoder.content_type})
+        else:
+            files = {'file': ('test_doc.pdf', f, 'application/pdf')}
+            response = authed_session.post(f"{BASE_URL}/documents/upload", files=files)
+    assert response.status_code == 200, f"Document upload failed: {response.status_code}"
+    
+    document_id = response_json(response)["id"]
+    document = poll_status(authed_session, f"{BASE_URL}/documents/{document_id}", ("completed", "error"), 60)
+    assert document is not None, "Document processing timeout"
+    assert document["status"] == "completed", f"Document processing failed: {document.get('error_message')}"
+    
+    request.config.cache.set(cache_key, document_id)
+    return document_id
+
+@pytest.fixture(scope="session")
+def ontology_id(request, authed_session, document_id):
+    """ID of an ontology generated once from the test document and reused across runs"""
+    ontology_data = {
+        "document_id": document_id,
+        "name": "Enhanced Test Ontology",
+        "description": "Test ontology for enhanced extraction pipeline"
+    }
+    
+    name_digest = hashlib.sha256(ontology_data["name"].encode()).hexdigest()[:16]
+    cache_key = f"deepinsight/ontology/{document_id}-{name_digest}"
+    ontology_id = _cached_resource(authed_session, request.config.cache, cache_key, "ontologies", "active")
+    if ontology_id:
+        return ontology_id
+    
+    response = authed_session.post(f"{BASE_URL}/ontologies/", json=ontology_data)
+    assert response.status_code == 200, f"Ontology creation failed: {response.status_code}"
+    
+    ontology_id = response_json(response)["id"]
+    ontology = poll_status(authed_session, f"{BASE_URL}/ontologies/{ontology_id}", ("active", "error"), 120)
+    assert ontology is not None, "Ontology processing timeout"
+    assert ontology["status"] == "active", "Ontology processing failed"
+    
+    request.config.cache.set(cache_key, ontology_id)
+    return ontology_id
@@ -6,19 +6,33 @@ This script tests the basic functionality of the DeepInsight system
 to ensure all components are working correctly.
 """
 
-import requests
 import json
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Skipped at collection (e.g. under `pytest -m unit`) when requests is missing
+requests = pytest.importorskip("requests")
+from requests.adapters import HTTPAdapter
+
+# Runs against the backend on localhost:8000
+pytestmark = pytest.mark.integration
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive session for every call, so the tests share a pooled connection
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "deepinsight-tests"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def test_health_check():
     """Test the health check endpoint"""
     print("🔍 Testing health check...")
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             print("✅ Health check passed")
             return True
@@ -40,7 +54,7 @@ def test_user_registration():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/register", json=user_data, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/auth/register", json=user_data, timeout=10)
         if response.status_code == 200:
             print("✅ User registration passed")
             return response.json()
@@ -62,7 +76,7 @@ def test_user_login():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/login", json=login_data, timeout=10)
+        response = SESSION.post(f"{BASE_URL}/auth/login", json=login_data, timeout=10)
         if response.status_code == 200:
             print("✅ User login passed")
             return response.json()
@@ -103,7 +117,7 @@ def test_document_upload(token):
     try:
         with open(test_file_path, "rb") as f:
             files = {"file": ("test_document.txt", f, "text/plain")}
-            response = requests.post(
+            response = SESSION.post(
                 f"{BASE_URL}/documents/upload",
                 files=files,
                 headers=headers,
@@ -143,13 +157,19 @@ def main():
     print("🚀 Starting DeepInsight System Tests")
     print("=" * 50)
     
-    # Test 1: Basic API connectivity
-    if not test_api_endpoints():
-        print("❌ Basic API tests failed. Is the backend running?")
-        sys.exit(1)
+    # Tests 1 and 2 are independent network round trips, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_check = executor.submit(test_api_endpoints)
+        registration = executor.submit(test_user_registration)
+        
+        # Test 1: Basic API connectivity
+        if not api_check.result():
+            print("❌ Basic API tests failed. Is the backend running?")
+            sys.exit(1)
+        
+        # Test 2: User registration
+        auth_response = registration.result()
     
-    # Test 2: User registration
-    auth_response = test_user_registration()
     if not auth_response:
         print("❌ User registration failed")
         sys.exit(1)